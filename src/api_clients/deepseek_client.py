@@ -6,11 +6,13 @@ Encapsulates API calls for business extraction and cooperation points.
 import logging
 import time
 import json
+import hashlib
+from pathlib import Path
 from typing import Optional, List, Dict, Any
 
 # Import specific OpenAI/HTTPX errors.
 from openai import OpenAI, APIError, RateLimitError, Timeout, APIConnectionError, BadRequestError
-import httpx  # add at top if missing
+import httpx
 
 # (Ensure the incorrect import below is REMOVED)
 # from src.core.target_company_data import _create_message # <--- DELETE THIS LINE
@@ -20,6 +22,13 @@ logger = logging.getLogger(__name__)
 if not logger.hasHandlers():
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
+# Optional persistent response cache
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
 # Helper function - MUST BE DEFINED HERE
 def _create_message(role: str, content: str) -> Dict[str, str]:
     """Creates a message dictionary for the DeepSeek API."""
@@ -29,6 +38,12 @@ def _create_message(role: str, content: str) -> Dict[str, str]:
     return {"role": role, "content": content}
 
 
+def _make_cache_key(model: str, messages: List[Dict[str, str]]) -> str:
+    """Builds a stable SHA-256 cache key from the canonicalized request fields."""
+    canonical = json.dumps({"model": model, "messages": messages}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
 class DeepSeekClient:
     """
     Encapsulates interactions with the DeepSeek API using the OpenAI library format.
@@ -38,6 +53,10 @@ class DeepSeekClient:
     DEFAULT_REQUEST_TIMEOUT = 30 # seconds
     DEFAULT_MAX_RETRIES = 3
     DEFAULT_INITIAL_DELAY = 1.0 # seconds
+    DEFAULT_CACHE_EXPIRE = 86400 # seconds
+    # Connection pool for the underlying HTTP transport
+    DEFAULT_MAX_CONNECTIONS = 64
+    DEFAULT_KEEPALIVE_EXPIRY = 75.0 # seconds
 
     def __init__(
         self,
@@ -45,7 +64,8 @@ class DeepSeekClient:
         base_url: str = DEFAULT_BASE_URL,
         request_timeout: int = DEFAULT_REQUEST_TIMEOUT,
         max_retries: int = DEFAULT_MAX_RETRIES,
-        initial_delay: float = DEFAULT_INITIAL_DELAY
+        initial_delay: float = DEFAULT_INITIAL_DELAY,
+        cache_dir: Optional[Path] = None
     ):
         """Initialize the DeepSeek client.
         
@@ -55,6 +75,7 @@ class DeepSeekClient:
             request_timeout: Timeout in seconds for API requests
             max_retries: Maximum number of retry attempts
             initial_delay: Initial delay between retries in seconds
+            cache_dir: Optional directory for a persistent response cache (requires diskcache)
         """
         if not api_key:
             raise ValueError("API key is required")
@@ -65,19 +86,48 @@ class DeepSeekClient:
         self.max_retries = max_retries
         self.initial_delay = initial_delay
         
+        # Reuse pooled keep-alive connections across calls instead of the SDK's default transport
+        self.http_client = httpx.Client(
+            timeout=request_timeout,
+            limits=httpx.Limits(
+                max_connections=self.DEFAULT_MAX_CONNECTIONS,
+                max_keepalive_connections=self.DEFAULT_MAX_CONNECTIONS,
+                keepalive_expiry=self.DEFAULT_KEEPALIVE_EXPIRY
+            )
+        )
+
         # Initialize the OpenAI client with our custom settings
         self.client = OpenAI(
             api_key=api_key,
             base_url=base_url,
             timeout=request_timeout,
-            max_retries=0  # We handle retries ourselves
+            max_retries=0,  # We handle retries ourselves
+            http_client=self.http_client
         )
+
+        # Response cache for the deterministic extraction calls
+        self._response_cache: Dict[str, str] = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._disk_cache = None
+        if cache_dir is not None:
+            if DISKCACHE_AVAILABLE:
+                self._disk_cache = diskcache.Cache(str(cache_dir))
+                logger.info("Persistent DeepSeek response cache enabled at %s", cache_dir)
+            else:
+                logger.warning("'diskcache' is not installed. Falling back to in-memory response cache only.")
         
         logger.info(
             "Initialized DeepSeekClient with base_url=%s, timeout=%ds, max_retries=%d, initial_delay=%.1fs",
             base_url, request_timeout, max_retries, initial_delay
         )
 
+    def close(self) -> None:
+        """Closes the pooled HTTP connections and the persistent response cache, if any."""
+        self.http_client.close()
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+
     def _get_completion(
         self,
         model: str,
@@ -152,6 +202,31 @@ class DeepSeekClient:
         logger.error(f"Failed to get completion for model '{model}' after {attempt} attempts. Last error: {last_exception!r}")
         return None
 
+    def _get_cached_completion(self, model: str, messages: List[Dict[str, str]]) -> Optional[str]:
+        """Returns a cached completion for identical requests, calling the API only on a miss."""
+        key = _make_cache_key(model, messages)
+        cached = self._response_cache.get(key)
+        if cached is None and self._disk_cache is not None:
+            cached = self._disk_cache.get(key)
+            if cached is not None:
+                self._response_cache[key] = cached
+        if cached is not None:
+            self._cache_hits += 1
+            logger.debug("Response cache hit for model '%s' (key %s...).", model, key[:12])
+            return cached
+
+        self._cache_misses += 1
+        completion = self._get_completion(model, messages)
+        if completion is not None: # Never cache failures
+            self._response_cache[key] = completion
+            if self._disk_cache is not None:
+                self._disk_cache.set(key, completion, expire=self.DEFAULT_CACHE_EXPIRE)
+        return completion
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Returns response cache hit/miss counters."""
+        return {"hits": self._cache_hits, "misses": self._cache_misses}
+
     # --- Public Methods ---
     # (Keep extract_main_business and identify_cooperation_points as previously refined)
     def extract_main_business(self, website_content: str, model: str = "deepseek-chat") -> Optional[str]:
@@ -173,7 +248,7 @@ class DeepSeekClient:
         """
         logger.info(f"Requesting main business extraction from DeepSeek API using model '{model}'...")
         messages = [_create_message("system", "..."), _create_message("user", prompt)]
-        main_business = self._get_completion(model, messages)
+        main_business = self._get_cached_completion(model, messages)
         if main_business: logger.info("Successfully extracted main business description.")
         else: logger.error("Failed to extract main business description...")
         return main_business
@@ -201,7 +276,7 @@ class DeepSeekClient:
         """
         logger.info(f"Requesting cooperation points identification from DeepSeek API using model '{model}'...")
         messages = [_create_message("system", "..."), _create_message("user", prompt)]
-        cooperation_points = self._get_completion(model, messages)
+        cooperation_points = self._get_cached_completion(model, messages)
         if cooperation_points and "no specific cooperation points" not in cooperation_points.lower():
              logger.info("Successfully identified potential cooperation points.")
              return cooperation_points
@@ -2,7 +2,7 @@
 """Module for reading data from DOCX files."""
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional, Union
 from docx import Document
 from docx.opc.exceptions import PackageNotFoundError
 
@@ -11,18 +11,20 @@ from docx.opc.exceptions import PackageNotFoundError
 
 logger = logging.getLogger(__name__)
 
-def read_skyfend_business(docx_file_path: Path) -> str | None:
+def read_skyfend_business(docx_file_path: Union[Path, BinaryIO]) -> str | None:
     """
     Read and extract text from a DOCX file, handling various edge cases.
     
     Args:
-        docx_file_path: Path to the DOCX file
+        docx_file_path: Path to the DOCX file, or a binary file-like object
+            (e.g. io.BytesIO) holding one, which is read without touching disk
         
     Returns:
         str: Extracted text from the document, or None if there was an error
     """
     try:
-        if not docx_file_path.is_file():
+        # File-like objects go straight to python-docx; only paths need the existence check
+        if not hasattr(docx_file_path, 'read') and not docx_file_path.is_file():
             logger.error(f"File not found: {docx_file_path}")
             return None
             
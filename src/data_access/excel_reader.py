@@ -8,14 +8,26 @@ from src.core import TargetCompanyData # Keep this import
 
 logger = logging.getLogger(__name__)
 
+# Columnar formats accepted alongside .xlsx, mapped to their pandas readers. They skip
+# openpyxl's per-cell parsing, and both require pyarrow (the 'columnar' extra).
+COLUMNAR_READERS = {'.parquet': pd.read_parquet, '.feather': pd.read_feather}
+
+def _read_company_table(file_path: Path) -> pd.DataFrame:
+    """Reads the raw company table, choosing the pandas reader by file suffix."""
+    suffix = Path(file_path).suffix.lower()
+    if suffix in COLUMNAR_READERS:
+        return COLUMNAR_READERS[suffix](file_path) # Requires pyarrow (the 'columnar' extra)
+    # Use openpyxl, handle potential NaN values gracefully during read
+    return pd.read_excel(file_path, engine='openpyxl', keep_default_na=False, na_values=[''])
+
 def read_company_data(file_path: Path) -> List[TargetCompanyData]:
     """
     Reads company data from an Excel file and returns a list of TargetCompanyData objects.
+    Parquet and Feather files with the same columns are read as well.
     Handles optional language column for manual language specification.
     """
     try:
-        # Use openpyxl, handle potential NaN values gracefully during read
-        df = pd.read_excel(file_path, engine='openpyxl', keep_default_na=False, na_values=[''])
+        df = _read_company_table(file_path)
         logging.info(f"Read Excel file: {file_path}. Original Columns: {list(df.columns)}")
     except FileNotFoundError:
         logging.error(f"Excel file not found at {file_path}")
@@ -27,6 +39,11 @@ def read_company_data(file_path: Path) -> List[TargetCompanyData]:
     # --- Normalize columns ---
     original_columns = list(df.columns)
     df.columns = [str(col).strip().lower() for col in df.columns]
+    duplicated = df.columns.duplicated()
+    if duplicated.any():
+        # e.g. 'Company' and 'company ' collapse to one name; keep the first such column
+        logging.warning(f"Ignoring duplicate columns after normalization (first one kept): {sorted(set(df.columns[duplicated]))}")
+        df = df.loc[:, ~duplicated]
     normalized_columns = list(df.columns)
     logging.info(f"Normalized Columns: {normalized_columns}")
 
@@ -44,55 +61,41 @@ def read_company_data(file_path: Path) -> List[TargetCompanyData]:
     else:
         logging.info("Optional 'language' column not found. Auto-detection will be used if needed.")
 
-    for index, row in df.iterrows():
-        try:
-            # Read values as strings, strip whitespace
-            company_name = str(row.get('company', '')).strip()
-            website = str(row.get('website', '')).strip()
-            recipient_email = str(row.get('recipient_email', '')).strip()
-            # Get the 'process' value as a string directly
-            process_flag_str = str(row.get('process', '')).strip() # Get the raw string value
-            contact_person_str = str(row.get('contact person', '')).strip()
-
-            # Basic validation for essential fields
-            if not company_name or not website or not recipient_email:
-                 logging.warning(f"Skipping row {index + 2} due to missing essential data (Company, Website, or Email).")
-                 continue
+    # --- Clean and validate all rows at once (column-wise instead of per row) ---
+    essential_columns = ['company', 'website', 'recipient_email']
+    text_columns = essential_columns + ['process', 'contact person']
+    if language_column_present:
+        text_columns.append('language')
+    # Missing cells (NaN/None) become '' so they are not read as the string 'nan'
+    cleaned = df.reindex(columns=text_columns).fillna('').astype(str).apply(lambda col: col.str.strip())
+    complete = cleaned[essential_columns].ne('').all(axis=1)
+    if not complete.all():
+        skipped_rows = [index + 2 for index in cleaned.index[~complete]]
+        logging.warning(f"Skipping {len(skipped_rows)} row(s) due to missing essential data (Company, Website, or Email). Excel rows: {skipped_rows}")
 
+    rows = cleaned[complete].itertuples(index=False, name=None)
+    for index, (company_name, website, recipient_email, process_flag_str, contact_person_str, *language) in zip(cleaned.index[complete], rows):
+        try:
             # --- Read Manual Language ---
             manual_language = None
-            if language_column_present and 'language' in row and pd.notna(row['language']):
-                lang_val = str(row['language']).strip().lower()
-                if (len(lang_val) == 2) or (len(lang_val) == 5 and '-' in lang_val):
-                    manual_language = lang_val
-                    logging.debug(f"Using manual language '{manual_language}' from Excel for {company_name}")
-                elif lang_val: # Only warn if non-empty but invalid
-                    logging.warning(f"Invalid language code format '{lang_val}' in Excel row {index + 2} for {company_name}. Ignoring.")
+            lang_val = language[0].lower() if language else ''
+            if (len(lang_val) == 2) or (len(lang_val) == 5 and '-' in lang_val):
+                manual_language = lang_val
+                logging.debug(f"Using manual language '{manual_language}' from Excel for {company_name}")
+            elif lang_val: # Only warn if non-empty but invalid
+                logging.warning(f"Invalid language code format '{lang_val}' in Excel row {index + 2} for {company_name}. Ignoring.")
             # --- End Read Manual Language ---
 
-            # Create the TargetCompanyData object using the correct keyword 'process_flag'
             company_obj = TargetCompanyData(
                 company_name=company_name,
                 website=website,
                 recipient_email=recipient_email,
-                # vvv THE ONLY SIGNIFICANT CHANGE IS HERE vvv
-                process_flag=process_flag_str, # Pass the string value with the keyword 'process_flag'
-                # ^^^ THE ONLY SIGNIFICANT CHANGE IS HERE ^^^
+                process_flag=process_flag_str, # Raw 'process' value; should_process interprets it
                 contact_person=contact_person_str or None, # Use None if empty string
                 target_language=manual_language,
-                # Initialize other fields (already matches TargetCompanyData defaults)
-                # main_business=None, # Not needed if default is None
-                # cooperation_points_str=None, # Not needed if default is None
-                # generated_letter_subject=None, # Not needed if default is None
-                # generated_letter_body=None, # Not needed if default is None
-                # processing_status=None, # Not needed if default is None
-                # draft_id=None # Not needed if default is None
             )
             companies.append(company_obj)
 
-        except KeyError as e:
-             # Log which column is missing if it's one we explicitly access
-             logging.error(f"Missing expected column key '{e}' while processing row {index + 2}. Check Excel headers. Skipping row.")
         except Exception as e:
             # Log other unexpected errors during row processing
             logging.error(f"Unexpected error processing row {index + 2} in Excel: {e}", exc_info=True)
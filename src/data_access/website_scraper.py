@@ -1,14 +1,61 @@
 # src/data_access/website_scraper.py
 """Module for fetching website content."""
+import codecs
 import logging
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from typing import Optional
 
+STREAM_CHUNK_SIZE = 8192 # bytes read per iteration when streaming a page
+
+# Use a common browser user-agent
+DEFAULT_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
+
+
+def _build_session() -> requests.Session:
+    """Creates a session with retries for common transient errors."""
+    session = requests.Session()
+    # Configure retries for common transient errors
+    retries = Retry(
+        total=3,
+        backoff_factor=0.5, # Shorter backoff
+        status_forcelist=[429, 500, 502, 503, 504], # Retry on these statuses
+        allowed_methods=["GET"] # Only retry GET requests
+    )
+    session.mount('https://', HTTPAdapter(max_retries=retries))
+    session.mount('http://', HTTPAdapter(max_retries=retries)) # Also handle http
+    return session
+
+# Shared across calls so connections to the same host are reused
+_SESSION = _build_session()
+
+
+def _read_limited_text(response: requests.Response, max_content_length: int) -> str:
+    """Streams the response body and stops reading once max_content_length characters are decoded."""
+    try:
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='ignore')
+    except LookupError:
+        # Fallback if the declared encoding is unknown
+        decoder = codecs.getincrementaldecoder('iso-8859-1')(errors='ignore')
+
+    parts = []
+    length = 0
+    for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+        text = decoder.decode(chunk)
+        parts.append(text)
+        length += len(text)
+        if length >= max_content_length:
+            break # Don't download the rest of the page
+    else:
+        parts.append(decoder.decode(b'', final=True))
+    return "".join(parts)
+
+
 def fetch_website_content(url: str, max_content_length: int = 2000, timeout: int = 15) -> Optional[str]:
     """
     Fetches content from a given URL with retries and timeout.
+    The body is streamed and reading stops once max_content_length characters are available.
 
     Args:
         url: The URL to fetch.
@@ -27,36 +74,11 @@ def fetch_website_content(url: str, max_content_length: int = 2000, timeout: int
         url = 'https://' + url
         logging.debug(f"Prepended 'https://' to URL: {url}")
 
-    session = requests.Session()
-    # Configure retries for common transient errors
-    retries = Retry(
-        total=3,
-        backoff_factor=0.5, # Shorter backoff
-        status_forcelist=[429, 500, 502, 503, 504], # Retry on these statuses
-        allowed_methods=["GET"] # Only retry GET requests
-    )
-    session.mount('https://', HTTPAdapter(max_retries=retries))
-    session.mount('http://', HTTPAdapter(max_retries=retries)) # Also handle http
-
-    # Use a common browser user-agent
-    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-
     try:
         logging.info(f"Attempting to fetch content from: {url}")
-        response = session.get(url, headers=headers, timeout=timeout, allow_redirects=True)
-        response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
-
-        # Decode content carefully, trying common encodings
-        content = None
-        try:
-            content = response.content.decode(response.encoding or 'utf-8', errors='ignore')
-        except (UnicodeDecodeError, LookupError):
-            # Fallback if initial decoding fails
-             try:
-                 content = response.content.decode('iso-8859-1', errors='ignore')
-             except Exception:
-                  logging.warning(f"Could not decode content from {url}")
-                  return None # Give up if decoding fails multiple times
+        with _SESSION.get(url, headers=DEFAULT_HEADERS, timeout=timeout, allow_redirects=True, stream=True) as response:
+            response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
+            content = _read_limited_text(response, max_content_length)
 
         if content:
              # TODO: Consider using BeautifulSoup to extract main text content instead of raw HTML?
@@ -3,10 +3,11 @@
 
 from .formatter import create_mime_email
 from .image_selector import select_relevant_images
-from .sender import save_email_to_drafts
+from .sender import save_email_to_drafts, save_emails_to_drafts
 
 __all__ = [
     "create_mime_email",
     "select_relevant_images",
     "save_email_to_drafts",
+    "save_emails_to_drafts",
 ]
\ No newline at end of file
@@ -72,14 +72,17 @@ def create_mime_email(
     # --- Embed inline images (using the generated CIDs) ---
     if image_replacements:
         for placeholder, (content_id, _, img_path) in image_replacements.items():
-            if not img_path or not Path(img_path).is_file(): # Check if path is valid Path object and exists
-                logging.warning(f"Inline image file not found or invalid path, skipping: {img_path} (for placeholder {placeholder})")
-                continue
+            # Open directly instead of stat-ing first: one syscall per image, not two
             try:
                 img_path_obj = Path(img_path) # Ensure it's a Path object
                 with open(img_path_obj, 'rb') as img_file:
-                    img_subtype = img_path_obj.suffix[1:].lower()
-                    mime_image = MIMEImage(img_file.read(), _subtype=img_subtype, name=img_path_obj.name)
+                    img_data = img_file.read()
+            except (OSError, TypeError, ValueError): # Missing, unreadable or malformed path
+                logging.warning(f"Inline image file not found or invalid path, skipping: {img_path} (for placeholder {placeholder})")
+                continue
+            try:
+                img_subtype = img_path_obj.suffix[1:].lower()
+                mime_image = MIMEImage(img_data, _subtype=img_subtype, name=img_path_obj.name)
 
                 # Add the Content-ID header, matching the cid used in the HTML tag
                 mime_image.add_header('Content-ID', f'<{content_id}>')
@@ -87,8 +90,6 @@ def create_mime_email(
 
                 msg_root.attach(mime_image)
                 logging.info(f"Attached inline image {img_path_obj.name} with CID: {content_id}") # Use INFO for successful attachment
-            except FileNotFoundError:
-                 logging.error(f"FileNotFoundError attaching inline image {img_path} for placeholder {placeholder}")
             except Exception as e:
                 logging.error(f"Error attaching inline image {img_path} for placeholder {placeholder}: {e}")
 
@@ -97,14 +98,17 @@ def create_mime_email(
         from email.mime.base import MIMEBase # Local import ok here
         from email import encoders       # Local import ok here
         for att_path in attachment_paths:
-            if not att_path or not Path(att_path).is_file(): # Check if path is valid Path object and exists
-                logging.warning(f"Attachment file not found or invalid path, skipping: {att_path}")
-                continue
+            # Open directly instead of stat-ing first: one syscall per attachment, not two
             try:
                 att_path_obj = Path(att_path) # Ensure it's a Path object
                 with open(att_path_obj, 'rb') as att_file:
-                    part = MIMEBase("application", "octet-stream")
-                    part.set_payload(att_file.read())
+                    att_data = att_file.read()
+            except (OSError, TypeError, ValueError): # Missing, unreadable or malformed path
+                logging.warning(f"Attachment file not found or invalid path, skipping: {att_path}")
+                continue
+            try:
+                part = MIMEBase("application", "octet-stream")
+                part.set_payload(att_data)
                 encoders.encode_base64(part)
                 part.add_header(
                     "Content-Disposition",
@@ -112,8 +116,6 @@ def create_mime_email(
                 )
                 msg_root.attach(part)
                 logging.info(f"Attached file: {att_path_obj.name}") # Use INFO
-            except FileNotFoundError:
-                logging.error(f"FileNotFoundError attaching file {att_path}")
             except Exception as e:
                 logging.error(f"Error attaching file {att_path}: {e}")
 
@@ -1,15 +1,29 @@
 # src/email_handler/image_selector.py
 """Module for selecting relevant images based on context."""
+import os
 import re
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Set
+from typing import FrozenSet, List
 
-def _extract_keywords_from_filename(filename_str: str) -> Set[str]:
-    """Extracts potential keywords from a filename string."""
+# Candidate image extensions, in the order score ties are broken
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif')
+
+# Patterns compiled once at import
+_LEADING_NOISE_RE = re.compile(r'^[\d._\s\-]+') # Leading numbers, dots, spaces, hyphens, underscores
+_DELIMITER_RE = re.compile(r'[\s_-]+')
+_CONTEXT_WORD_RE = re.compile(r'\b\w+\b')
+
+@lru_cache(maxsize=1024)
+def _extract_keywords_from_filename(filename_str: str) -> FrozenSet[str]:
+    """
+    Extracts potential keywords from a filename string.
+    Cached: the same image files are scored for every email, so each name is parsed once.
+    """
     cleaned_filename_str = filename_str.strip() # Strip input first
     if not cleaned_filename_str:
-        return set()
+        return frozenset()
 
     # Use the cleaned string for Path operations
     filename_path = Path(cleaned_filename_str)
@@ -24,13 +38,13 @@ def _extract_keywords_from_filename(filename_str: str) -> Set[str]:
 
     # Remove leading numbers, dots, spaces, hyphens, UNDERSCORES for cleaner word splitting
     # Also strip remaining whitespace from the result
-    base_cleaned = re.sub(r'^[\d._\s\-]+', '', base).strip()
+    base_cleaned = _LEADING_NOISE_RE.sub('', base).strip()
 
     # Split by sequences of common delimiters and clean parts
     words = set()
     if base_cleaned: # Only split if base_cleaned is not empty
         # Use regex split for better handling of multiple delimiters
-        parts = re.split(r'[\s_-]+', base_cleaned)
+        parts = _DELIMITER_RE.split(base_cleaned)
         for part in parts:
             cleaned_part = part.strip().lower()
             # Optional: Add more filtering like minimum length if needed
@@ -51,7 +65,19 @@ def _extract_keywords_from_filename(filename_str: str) -> Set[str]:
     keywords.discard('')
 
     logging.debug(f"Keywords extracted from '{filename}': {keywords}")
-    return keywords
+    return frozenset(keywords) # Immutable, so the cached result is safe to share
+
+
+def _list_candidate_images(image_dir: Path) -> List[Path]:
+    """Lists image files with one directory scan instead of one glob per extension."""
+    by_extension = {ext: [] for ext in IMAGE_EXTENSIONS}
+    with os.scandir(image_dir) as entries:
+        for entry in entries:
+            ext = os.path.splitext(entry.name)[1]
+            # DirEntry caches the file type, so is_file() needs no extra stat on most filesystems
+            if ext in by_extension and entry.is_file():
+                by_extension[ext].append(image_dir / entry.name)
+    return [path for paths in by_extension.values() for path in paths]
 
 
 def select_relevant_images(
@@ -76,11 +102,8 @@ def select_relevant_images(
         logging.error(f"Image directory not found: {image_dir}")
         return []
 
-    # Find candidate image files (adjust patterns if needed)
-    candidate_images = list(image_dir.glob("*.jpg")) + \
-                       list(image_dir.glob("*.jpeg")) + \
-                       list(image_dir.glob("*.png")) + \
-                       list(image_dir.glob("*.gif")) # Add other types if necessary
+    # Find candidate image files (extend IMAGE_EXTENSIONS for other types)
+    candidate_images = _list_candidate_images(image_dir)
 
     if not candidate_images:
         logging.warning(f"No candidate images found in: {image_dir}")
@@ -90,7 +113,7 @@ def select_relevant_images(
     # Create context words from email body and company name
     context_text = f"{email_body} {company_name}".lower()
     # Extract words (alphanumeric sequences)
-    context_words = set(re.findall(r'\b\w+\b', context_text))
+    context_words = set(_CONTEXT_WORD_RE.findall(context_text))
     logging.debug(f"Context words for scoring (sample): {list(context_words)[:20]}")
 
     # Score images based on keyword overlap
@@ -5,7 +5,7 @@ import logging
 import os.path
 import time
 from email.message import Message # Use Message for type hint
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 
 # Ensure necessary imports for google libraries are present
 from google.auth.transport.requests import Request
@@ -14,11 +14,23 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+# Optional SIMD base64 codec; same API and output as the stdlib module
+try:
+    import pybase64 as _b64
+except ImportError:
+    _b64 = base64
+
 # If modifying these scopes, delete the file token.json.
 SCOPES = ['https://www.googleapis.com/auth/gmail.compose', # To create drafts
           'https://www.googleapis.com/auth/gmail.modify'] # Also needed for drafts
 
 DEFAULT_TOKEN_PATH = 'token.json' # Store token in root by default
+GMAIL_BATCH_LIMIT = 100 # Gmail accepts at most 100 calls in one batch request
+
+# Gmail API client per (credentials path, token path), stored with the token file's mtime
+# when it was built; a rewritten token file invalidates the entry. Drafts are saved from
+# one thread, so clients are not shared across threads.
+_SERVICE_CACHE: Dict[Tuple[str, str], Tuple[Optional[float], Any]] = {}
 
 def _get_gmail_credentials(credentials_path: str, token_path: str = DEFAULT_TOKEN_PATH) -> Optional[Credentials]:
     """Gets valid user credentials from storage or initiates OAuth flow."""
@@ -90,6 +102,40 @@ def _get_gmail_credentials(credentials_path: str, token_path: str = DEFAULT_TOKE
     return creds
 
 
+def _token_mtime(token_path: str) -> Optional[float]:
+    """Modification time of the token file, or None if it does not exist."""
+    try:
+        return os.path.getmtime(token_path)
+    except OSError:
+        return None
+
+
+def _get_gmail_service(credentials_path: str, token_path: str = DEFAULT_TOKEN_PATH):
+    """
+    Returns the Gmail API client, building it on first use and reusing it for later drafts.
+    The client refreshes its own access token; it is rebuilt only if the token file changes.
+    Returns None if credentials could not be obtained.
+    """
+    cache_key = (credentials_path, token_path)
+    cached = _SERVICE_CACHE.get(cache_key)
+    if cached and cached[0] == _token_mtime(token_path):
+        return cached[1]
+    _SERVICE_CACHE.pop(cache_key, None) # Token rewritten (or first use): drop the stale client
+    creds = _get_gmail_credentials(credentials_path, token_path)
+    if not creds:
+        return None
+    service = build('gmail', 'v1', credentials=creds)
+    # Read the mtime after _get_gmail_credentials, which may have just rewritten the token
+    _SERVICE_CACHE[cache_key] = (_token_mtime(token_path), service)
+    return service
+
+
+def _draft_request_body(mime_message: Message) -> dict:
+    """Builds the drafts.create request body for a MIME message (base64url-encoded raw bytes)."""
+    encoded_message = _b64.urlsafe_b64encode(mime_message.as_bytes()).decode('ascii')
+    return {'message': {'raw': encoded_message}}
+
+
 def save_email_to_drafts(
     mime_message: Message,
     credentials_path: str,
@@ -109,16 +155,13 @@ def save_email_to_drafts(
     Returns:
         The ID of the created draft, or None if an error occurred.
     """
-    creds = _get_gmail_credentials(credentials_path, token_path)
-    if not creds:
-        logging.error("Failed to obtain Gmail credentials. Cannot save draft.")
-        return None
-
     try:
-        service = build('gmail', 'v1', credentials=creds)
+        service = _get_gmail_service(credentials_path, token_path)
+        if service is None:
+            logging.error("Failed to obtain Gmail credentials. Cannot save draft.")
+            return None
         # Encode message to base64url format
-        encoded_message = base64.urlsafe_b64encode(mime_message.as_bytes()).decode()
-        create_draft_request_body = {'message': {'raw': encoded_message}}
+        create_draft_request_body = _draft_request_body(mime_message)
 
         # pylint: disable=E1101
         draft = service.users().drafts().create(
@@ -140,4 +183,60 @@ def save_email_to_drafts(
         return None
     except Exception as e:
         logging.error(f'An unexpected error occurred while saving draft: {e}', exc_info=True)
-        return None
\ No newline at end of file
+        return None
+
+
+def save_emails_to_drafts(
+    mime_messages: List[Message],
+    credentials_path: str,
+    token_path: str = DEFAULT_TOKEN_PATH,
+    user_id: str = 'me'
+    ) -> List[Optional[str]]:
+    """
+    Creates one draft per message, sending up to GMAIL_BATCH_LIMIT creates per HTTP request.
+
+    Args:
+        mime_messages: The email.message.Message objects to save.
+        credentials_path: Path to the Google Cloud credentials.json file.
+        token_path: Path where the token.json file is stored/will be stored.
+        user_id: User's email address, or 'me' for the authenticated user.
+
+    Returns:
+        The draft IDs in the same order as mime_messages, with None for each draft that failed.
+    """
+    draft_ids: List[Optional[str]] = [None] * len(mime_messages)
+    if not mime_messages:
+        return draft_ids
+
+    def _store_draft_id(request_id, response, exception):
+        index = int(request_id)
+        if exception is not None:
+            logging.error(f'An HTTP error occurred while saving draft {index + 1}/{len(mime_messages)}: {exception}')
+        elif not response or not response.get('id'):
+            logging.error(f"Draft {index + 1}/{len(mime_messages)} created but no ID returned by API.")
+        else:
+            draft_ids[index] = response['id']
+
+    try:
+        service = _get_gmail_service(credentials_path, token_path)
+        if service is None:
+            logging.error("Failed to obtain Gmail credentials. Cannot save drafts.")
+            return draft_ids
+        # pylint: disable=E1101
+        drafts = service.users().drafts()
+        for start in range(0, len(mime_messages), GMAIL_BATCH_LIMIT):
+            batch = service.new_batch_http_request(callback=_store_draft_id)
+            for index in range(start, min(start + GMAIL_BATCH_LIMIT, len(mime_messages))):
+                batch.add(
+                    drafts.create(userId=user_id, body=_draft_request_body(mime_messages[index])),
+                    request_id=str(index)
+                )
+            batch.execute()
+    except HttpError as error:
+        logging.error(f'An HTTP error occurred while saving drafts: {error}')
+    except Exception as e:
+        logging.error(f'An unexpected error occurred while saving drafts: {e}', exc_info=True)
+
+    saved = sum(draft_id is not None for draft_id in draft_ids)
+    logging.info(f'Created {saved}/{len(mime_messages)} drafts.')
+    return draft_ids
@@ -7,6 +7,7 @@ Current time: Sunday, March 30, 2025 at 8:26:49 AM (User Context).
 """
 
 from datetime import datetime
+from email.message import Message
 import logging
 import os
 import sys
@@ -15,7 +16,7 @@ import configparser
 from pathlib import Path
 from dotenv import load_dotenv
 import pandas as pd # Import pandas for duplicate checking
-from typing import List, Optional # Import typing for type hints
+from typing import Dict, List, Optional, Tuple # Import typing for type hints
 
 # --- Determine Project Root ---
 # Assumes main.py is in the src/ directory relative to the project root
@@ -65,24 +66,35 @@ try:
     from src.email_handler import (
         create_mime_email,
         select_relevant_images,
-        save_email_to_drafts
+        save_emails_to_drafts
     )
-    from src.utils import save_processed_data # Use the specific save function
+    from src.utils import save_processed_data, read_processed_data, is_valid_email, read_cached_by_mtime # Use the specific save function
 except ImportError as import_err:
      # Use logging if available, otherwise print
      logging.critical(f"Failed to import necessary project modules: {import_err}. Ensure PYTHONPATH or project structure is correct.", exc_info=True)
      sys.exit(f"Import Error: {import_err}")
 
 
+# --- Process-scope caches (invalidated when the file's mtime changes) ---
+_CONFIG_CACHE: Dict[Path, Tuple[float, configparser.ConfigParser]] = {}
+_SKYFEND_DESC_CACHE: Dict[Path, Tuple[float, str]] = {}
+
+
 # --- Configuration Loading Function ---
 def load_configuration(config_path: Path) -> Optional[configparser.ConfigParser]:
-    """Loads configuration from the specified .ini file."""
+    """Loads configuration from the specified .ini file, reusing the parsed result while the file is unchanged."""
     if not config_path.is_file():
         logging.error(f"Configuration file not found at: {config_path}")
         return None
     try:
+        mtime = config_path.stat().st_mtime
+        cached = _CONFIG_CACHE.get(config_path)
+        if cached and cached[0] == mtime:
+            logging.debug(f"Using cached configuration for {config_path}")
+            return cached[1]
         config = configparser.ConfigParser(interpolation=None)
         config.read(config_path, encoding='utf-8')
+        _CONFIG_CACHE[config_path] = (mtime, config)
         logging.info(f"Configuration loaded from {config_path}")
         return config
     except configparser.Error as e:
@@ -93,6 +105,7 @@ def load_configuration(config_path: Path) -> Optional[configparser.ConfigParser]
         return None
 
 
+
 # --- Main Application Logic ---
 def run_process():
     """Encapsulates the main processing workflow."""
@@ -103,6 +116,7 @@ def run_process():
     # Declare variable for partial results handling in finally block
     companies_processed_this_run: List[TargetCompanyData] = []
     processed_data_path: Optional[Path] = None # Initialize path variable
+    deepseek_client: Optional[DeepSeekClient] = None # Closed in the finally block
 
     try:
         # --- Load Configuration ---
@@ -162,11 +176,13 @@ def run_process():
         max_content_length = scraper_config.getint('max_content_length', 3000)
         scraper_timeout = scraper_config.getint('timeout', 20)
         api_request_timeout = api_client_config.getint('request_timeout', 45)
+        response_cache_dir_str = api_client_config.get('response_cache_dir')
+        response_cache_dir = PROJECT_ROOT / response_cache_dir_str if response_cache_dir_str else None
 
 
         # --- Initialize Services/Clients ---
         logging.info("Initializing API clients and generators...")
-        deepseek_client = DeepSeekClient(api_key=deepseek_api_key, request_timeout=api_request_timeout)
+        deepseek_client = DeepSeekClient(api_key=deepseek_api_key, request_timeout=api_request_timeout, cache_dir=response_cache_dir)
         letter_generator = DeepSeekLetterGenerator(deepseek_client=deepseek_client)
 
         # --- Initial Data Loading ---
@@ -176,7 +192,7 @@ def run_process():
         if not company_data_path.is_file():
              raise FileNotFoundError(f"Company data Excel file not found at: {company_data_path}")
 
-        skyfend_desc = read_skyfend_business(skyfend_business_path)
+        skyfend_desc = read_cached_by_mtime(skyfend_business_path, read_skyfend_business, _SKYFEND_DESC_CACHE)
         if not skyfend_desc:
              raise ValueError("Failed to read Skyfend business description. Cannot proceed.")
         skyfend_info = MyOwnCompanyBusinessData(description=skyfend_desc)
@@ -193,7 +209,7 @@ def run_process():
         processed_companies_df = pd.DataFrame(columns=['recipient_email'])
         if processed_data_path.exists():
              try:
-                  processed_companies_df = pd.read_excel(processed_data_path)
+                  processed_companies_df = read_processed_data(processed_data_path)
                   if 'recipient_email' in processed_companies_df.columns:
                        processed_companies_df['recipient_email'] = processed_companies_df['recipient_email'].astype(str).str.strip().str.lower()
                        logging.info(f"Loaded {len(processed_companies_df)} records from previous run: {processed_data_path}")
@@ -206,38 +222,33 @@ def run_process():
 
         already_processed_emails = set(processed_companies_df['recipient_email']) if 'recipient_email' in processed_companies_df.columns else set()
 
+        # --- Pre-filter companies in a single pass ---
+        # Skipped companies get their status here and are not recorded in the output file
+        to_process: List[TargetCompanyData] = []
+        for company in companies:
+            recipient_email = company.recipient_email.strip()
+            if not company.should_process:
+                logging.info(f"Skipping '{company.company_name}' because 'process' flag is not 'yes'.")
+                company.update_status("Skipped: Process flag")
+            elif recipient_email.lower() in already_processed_emails:
+                logging.info(f"Skipping '{company.company_name}' ({company.recipient_email}) as email already processed.")
+                company.update_status("Skipped: Already processed")
+            elif not is_valid_email(recipient_email):
+                logging.warning(f"Skipping '{company.company_name}' due to invalid email format: {company.recipient_email}")
+                company.update_status("Skipped: Invalid email format")
+            else:
+                to_process.append(company)
+        logging.info(f"{len(to_process)} of {len(companies)} companies remain after filtering.")
+
         # --- Main Processing Loop ---
         # companies_processed_this_run initialized earlier
-        for i, company in enumerate(companies):
+        pending_drafts: List[Tuple[TargetCompanyData, Message]] = []
+        for i, company in enumerate(to_process):
             start_loop_time = time.time()
-            logging.info(f"--- Processing company {i+1}/{len(companies)}: {company.company_name} ---")
-            should_record_attempt = True
+            logging.info(f"--- Processing company {i+1}/{len(to_process)}: {company.company_name} ---")
 
             try:
-                # 1. Check if should process based on flag
-                if not company.should_process:
-                    logging.info(f"Skipping '{company.company_name}' because 'process' flag is not 'yes'.")
-                    company.update_status("Skipped: Process flag")
-                    # No need to record if skipped by design
-                    should_record_attempt = False
-                    continue
-
-                # 2. Check if already processed
-                current_email_lower = company.recipient_email.strip().lower()
-                if current_email_lower in already_processed_emails:
-                     logging.info(f"Skipping '{company.company_name}' ({company.recipient_email}) as email already processed.")
-                     company.update_status("Skipped: Already processed")
-                     should_record_attempt = False
-                     continue
-
-                # 3. Validate Email Format (Basic)
-                if '@' not in company.recipient_email or '.' not in company.recipient_email.split('@')[-1]:
-                     logging.warning(f"Skipping '{company.company_name}' due to invalid email format: {company.recipient_email}")
-                     company.update_status("Skipped: Invalid email format")
-                     should_record_attempt = False
-                     continue
-
-                # 4. Fetch Website Content
+                # 1. Fetch Website Content
                 logging.info(f"Fetching website content for: {company.website}")
                 website_content = fetch_website_content(company.website, max_content_length, scraper_timeout)
                 if website_content is None:
@@ -245,14 +256,14 @@ def run_process():
                     company.update_status("Error: Failed to fetch website") # Set status before raising
                     raise ValueError("Website fetch failed")
 
-                # 5. Extract Main Business
+                # 2. Extract Main Business
                 logging.info(f"Extracting main business for '{company.company_name}'...")
                 extracted_business = deepseek_client.extract_main_business(website_content or "") # Use result directly
                 company.main_business = extracted_business if extracted_business else "Not Available"
                 if company.main_business == "Not Available":
                     logging.warning(f"Could not extract main business for '{company.company_name}'.")
 
-                # 6. Identify Cooperation Points
+                # 3. Identify Cooperation Points
                 logging.info(f"Identifying cooperation points for '{company.company_name}'...")
                 extracted_points = deepseek_client.identify_cooperation_points(
                     skyfend_business_desc=skyfend_info.description,
@@ -262,7 +273,7 @@ def run_process():
                 if company.cooperation_points_str == "Not Available":
                      logging.warning(f"Could not identify cooperation points for '{company.company_name}'.")
 
-                # 7. Generate Developing Letter
+                # 4. Generate Developing Letter
                 logging.info(f"Generating letter for '{company.company_name}'...")
                 contact_person = company.contact_person or company.company_name # Use company name if contact empty
                 # Ensure cooperation points are passed, even if "Not Available"
@@ -281,7 +292,7 @@ def run_process():
                 else:
                      company.set_letter_content(generated_letter.subject, generated_letter.body_html)
 
-                # 8. Select Relevant Images
+                # 5. Select Relevant Images
                 logging.info(f"Selecting images for '{company.company_name}'...")
                 selected_images: List[Path] = select_relevant_images(
                     image_dir=unified_images_dir,
@@ -293,10 +304,9 @@ def run_process():
                     logging.warning(f"Could not select exactly {max_images_per_email} images for '{company.company_name}' (found {len(selected_images)}). Skipping email draft.")
                     company.update_status(f"Skipped: Found {len(selected_images)}/{max_images_per_email} images")
                     # Treat as a skippable condition, not a critical error for the whole run
-                    should_record_attempt = True # Record the attempt and skip status
-                    continue # Skip draft creation for this company
+                    continue # Skip draft creation; the attempt is still recorded
 
-                # 9. Create MIME Email
+                # 6. Create MIME Email
                 logging.info(f"Creating MIME email for '{company.company_name}'...")
                 attachments = []
                 if product_brochure_path.is_file():
@@ -313,22 +323,9 @@ def run_process():
                     attachment_paths=attachments
                 )
 
-                # 10. Save Email to Drafts
-                logging.info(f"Saving email draft for '{company.company_name}'...")
-                draft_id = save_email_to_drafts(
-                    mime_message=mime_message,
-                    credentials_path=str(credentials_json_path),
-                    token_path=str(token_json_path)
-                    )
-
-                if draft_id:
-                    company.set_draft_id(draft_id)
-                    company.update_status(f"Success: Draft ID {draft_id}")
-                    logging.info(f"Successfully processed and saved draft for {company.company_name}.")
-                else:
-                    # Error logged within save_email_to_drafts
-                    company.update_status("Error: Failed to save draft")
-                    raise ValueError("Failed to save draft") # Treat failure to save draft as error
+                # 7. Queue the draft; all drafts are saved in batched requests after the loop
+                pending_drafts.append((company, mime_message))
+                company.update_status("Pending: Draft not saved")
 
             except Exception as e:
                 # Catch errors during the processing of a single company
@@ -339,15 +336,31 @@ def run_process():
                 # Default: log error and continue with next company
 
             finally:
-                # Ensure the company's result (success or failure state) is recorded if not skipped initially
-                if should_record_attempt:
-                    companies_processed_this_run.append(company)
+                # Ensure the company's result (success or failure state) is recorded
+                companies_processed_this_run.append(company)
                 loop_duration = time.time() - start_loop_time
                 logging.info(f"--- Finished processing {company.company_name} in {loop_duration:.2f}s. Status: {company.processing_status or 'Unknown'} ---")
                 # Optional delay between processing companies
                 # time.sleep(1)
 
 
+        # --- Save Queued Drafts ---
+        if pending_drafts:
+            logging.info(f"Saving {len(pending_drafts)} email drafts...")
+            draft_ids = save_emails_to_drafts(
+                [mime_message for _, mime_message in pending_drafts],
+                credentials_path=str(credentials_json_path),
+                token_path=str(token_json_path)
+            )
+            for (company, _), draft_id in zip(pending_drafts, draft_ids):
+                if draft_id:
+                    company.set_draft_id(draft_id)
+                    company.update_status(f"Success: Draft ID {draft_id}")
+                    logging.info(f"Successfully processed and saved draft for {company.company_name}.")
+                else:
+                    # Error logged within save_emails_to_drafts
+                    company.update_status("Error: Failed to save draft")
+
         # --- Save All Processed Data for this Run ---
         if companies_processed_this_run:
              logging.info(f"Saving results for {len(companies_processed_this_run)} companies processed or skipped this run...")
@@ -377,6 +390,8 @@ def run_process():
              save_processed_data(companies_processed_this_run, error_path)
         sys.exit(f"Critical Error: {e}")
     finally:
+        if deepseek_client is not None:
+            deepseek_client.close() # Release pooled HTTP connections
         end_time = time.time()
         logging.info(f"Total process finished or terminated in {end_time - start_time:.2f} seconds.")
 
@@ -9,6 +9,7 @@ Current time: Monday, March 31, 2025 at 03:06:59 AM (User Context).
 """
 
 from datetime import datetime
+from email.message import Message
 import logging
 import os
 import sys
@@ -17,7 +18,7 @@ import configparser
 from pathlib import Path
 from dotenv import load_dotenv
 import pandas as pd  # Import pandas for duplicate checking
-from typing import List, Optional  # Import typing for type hints
+from typing import Dict, List, Optional, Tuple  # Import typing for type hints
 
 # Assuming determine_language now accepts recipient_email
 from src.language_detector import determine_language
@@ -72,10 +73,10 @@ try:
     from src.email_handler import (
         create_mime_email,
         select_relevant_images,
-        save_email_to_drafts
+        save_emails_to_drafts
     )
     # Use the exposed function from utils package
-    from src.utils import save_processed_data
+    from src.utils import save_processed_data, read_processed_data, is_valid_email, read_cached_by_mtime
 except ImportError as import_err:
     # Use logging if available, otherwise print
     logging.critical(f"Failed to import necessary project modules: {import_err}. Ensure PYTHONPATH or project structure is correct.", exc_info=True)
@@ -99,6 +100,10 @@ def load_configuration(config_path: Path) -> Optional[configparser.ConfigParser]
         logging.error(f"Unexpected error loading configuration {config_path}: {e}", exc_info=True)
         return None
 
+# --- Process-scope cache (invalidated when the document's mtime changes) ---
+_SKYFEND_DESC_CACHE: Dict[Path, Tuple[float, str]] = {}
+
+
 # --- Main Application Logic ---
 def run_process():
     """Encapsulates the main processing workflow with language detection."""
@@ -109,6 +114,7 @@ def run_process():
     # Declare variable for partial results handling in finally block
     companies_processed_this_run: List[TargetCompanyData] = []
     processed_data_path: Optional[Path] = None  # Initialize path variable
+    deepseek_client: Optional[DeepSeekClient] = None # Closed in the finally block
 
     try:
         # --- Load Configuration ---
@@ -194,18 +200,20 @@ def run_process():
         max_content_length = scraper_config.getint('max_content_length', 5000) # Increased default
         scraper_timeout = scraper_config.getint('timeout', 30) # Increased default
         api_request_timeout = api_client_config.getint('request_timeout', 60) # Increased default
+        response_cache_dir_str = api_client_config.get('response_cache_dir')
+        response_cache_dir = PROJECT_ROOT / response_cache_dir_str if response_cache_dir_str else None
         process_delay = app_settings.getfloat('process_delay_seconds', 0.5) # Optional delay
 
         # --- Initialize Services/Clients ---
         logging.info("Initializing API clients and generators...")
         # Pass relevant config directly if needed, e.g., timeout
-        deepseek_client = DeepSeekClient(api_key=deepseek_api_key, request_timeout=api_request_timeout)
+        deepseek_client = DeepSeekClient(api_key=deepseek_api_key, request_timeout=api_request_timeout, cache_dir=response_cache_dir)
         letter_generator = DeepSeekLetterGenerator(deepseek_client=deepseek_client)
 
         # --- Initial Data Loading ---
         logging.info("Loading initial data...")
         # File existence checked earlier during config extraction
-        skyfend_desc = read_skyfend_business(skyfend_business_path)
+        skyfend_desc = read_cached_by_mtime(skyfend_business_path, read_skyfend_business, _SKYFEND_DESC_CACHE)
         if not skyfend_desc:
             # This should ideally not happen if FileNotFoundError is caught, but check defensively
             raise ValueError("Failed to read Skyfend business description. Cannot proceed.")
@@ -224,7 +232,7 @@ def run_process():
         already_processed_emails = set()
         if processed_data_path.exists():
             try:
-                processed_companies_df = pd.read_excel(processed_data_path)
+                processed_companies_df = read_processed_data(processed_data_path)
                 if 'recipient_email' in processed_companies_df.columns:
                     # Convert to string, strip whitespace, lowercase, handle potential NaN/None
                     processed_companies_df.dropna(subset=['recipient_email'], inplace=True)
@@ -240,6 +248,7 @@ def run_process():
 
         # --- Main Processing Loop ---
         # companies_processed_this_run initialized earlier
+        pending_drafts: List[Tuple[TargetCompanyData, Message]] = []
         for i, company in enumerate(companies):
             start_loop_time = time.time()
             logging.info(f"--- Processing company {i+1}/{len(companies)}: {company.company_name} ({company.recipient_email}) ---")
@@ -270,7 +279,7 @@ def run_process():
                     continue
 
                 # 3. Validate Email Format (Basic) - Re-check just in case
-                if '@' not in current_email_lower or '.' not in current_email_lower.split('@')[-1]:
+                if not is_valid_email(current_email_lower):
                     logging.warning(f"Skipping '{company.company_name}' due to invalid email format: {company.recipient_email}")
                     company.update_status("Skipped: Invalid email format")
                     should_record_attempt = False # Don't record invalid emails
@@ -420,22 +429,9 @@ def run_process():
                         attachment_paths=attachments # Pass potentially empty list
                     )
 
-                    # 11. Save Email to Drafts
-                    logging.info(f"Saving email draft for '{company.company_name}'...")
-                    draft_id = save_email_to_drafts(
-                        mime_message=mime_message,
-                        credentials_path=str(credentials_json_path),
-                        token_path=str(token_json_path) # Pass the path for token refresh/save
-                    )
-
-                    if draft_id:
-                        company.set_draft_id(draft_id)
-                        company.update_status(f"Success: Draft ID {draft_id}")
-                        logging.info(f"Successfully processed and saved draft for {company.company_name}.")
-                    else:
-                        # Error logged within save_email_to_drafts
-                        company.update_status("Error: Failed to save draft")
-                        # Don't raise, just record status
+                    # 11. Queue the draft; all drafts are saved in batched requests after the loop
+                    pending_drafts.append((company, mime_message))
+                    company.update_status("Pending: Draft not saved")
 
             except Exception as e:
                 # Catch any unexpected errors during a company's processing cycle
@@ -464,6 +460,23 @@ def run_process():
                      logging.debug(f"Waiting for {process_delay}s before next company...")
                      time.sleep(process_delay)
 
+        # --- Save Queued Drafts ---
+        if pending_drafts:
+            logging.info(f"Saving {len(pending_drafts)} email drafts...")
+            draft_ids = save_emails_to_drafts(
+                [mime_message for _, mime_message in pending_drafts],
+                credentials_path=str(credentials_json_path),
+                token_path=str(token_json_path) # Pass the path for token refresh/save
+            )
+            for (company, _), draft_id in zip(pending_drafts, draft_ids):
+                if draft_id:
+                    company.set_draft_id(draft_id)
+                    company.update_status(f"Success: Draft ID {draft_id}")
+                    logging.info(f"Successfully processed and saved draft for {company.company_name}.")
+                else:
+                    # Error logged within save_emails_to_drafts; don't raise, just record status
+                    company.update_status("Error: Failed to save draft")
+
         # --- Save All Processed Data for this Run ---
         if companies_processed_this_run:
             logging.info(f"Attempting to save results for {len(companies_processed_this_run)} companies processed or recorded in this run...")
@@ -508,6 +521,8 @@ def run_process():
         # Don't sys.exit here
         return # Stop execution
     finally:
+        if deepseek_client is not None:
+            deepseek_client.close() # Release pooled HTTP connections
         # Log total time regardless of success or failure
         end_time = time.time()
         duration = end_time - start_time
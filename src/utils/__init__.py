@@ -1,7 +1,7 @@
 # src/utils/__init__.py
 """Package for utility functions and helper modules."""
 
-from .helpers import setup_logging # Expose logging setup
-from .excel_writer_to_save_data import save_processed_data
+from .helpers import setup_logging, is_valid_email, read_cached_by_mtime # Expose logging setup, email check and mtime cache
+from .excel_writer_to_save_data import save_processed_data, read_processed_data
 
-__all__ = ["setup_logging", "save_processed_data"]
\ No newline at end of file
+__all__ = ["setup_logging", "is_valid_email", "read_cached_by_mtime", "save_processed_data", "read_processed_data"]
\ No newline at end of file
@@ -3,8 +3,9 @@
 import logging
 import pandas as pd
 from pathlib import Path
-from typing import List
-from dataclasses import asdict, is_dataclass
+from typing import Dict, List
+from dataclasses import fields, is_dataclass
+from operator import attrgetter
 from datetime import datetime
 # --- Add openpyxl utility import ---
 try:
@@ -14,6 +15,16 @@ except ImportError:
     OPENPYXL_AVAILABLE = False
     logging.info("openpyxl not fully available. Column width adjustment will be skipped. Install with `poetry add openpyxl` or `pip install openpyxl`")
 # --- End import ---
+# Optional faster write-only engine; openpyxl is used when it is missing
+try:
+    import xlsxwriter # noqa: F401
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+# xlsxwriter options: keep websites/emails as plain text, as openpyxl writes them.
+# constant_memory is deliberately not set: pandas writes column by column, and that
+# mode silently drops cells written out of row order.
+XLSXWRITER_OPTIONS = {'strings_to_urls': False}
 
 # Assuming TargetCompanyData is correctly defined in src.core
 try:
@@ -24,6 +35,103 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Order/subset of columns written to the results file; built once rather than per save
+OUTPUT_COLUMNS = (
+    'saving_file_time', 'company_name', 'website', 'recipient_email',
+    'contact_person', 'process_flag', 'target_language', 'main_business',
+    'cooperation_points_str', 'generated_letter_subject',
+    'generated_letter_body', 'processing_status', 'draft_id'
+)
+
+# Feather schema metadata recording which workbook version the copy mirrors
+FEATHER_MTIME_KEY = b'workbook_mtime_ns'
+FEATHER_SIZE_KEY = b'workbook_size'
+
+def _write_workbook(df: pd.DataFrame, output_excel_path: Path, sheet_name: str = 'ProcessedData'):
+    """
+    Writes the combined DataFrame to the workbook and sizes each column to its header.
+    Kept separate so callers (and tests) can intercept the final frame before serialization.
+    """
+    if XLSXWRITER_AVAILABLE:
+        engine, engine_kwargs = 'xlsxwriter', {'options': XLSXWRITER_OPTIONS}
+    else:
+        engine, engine_kwargs = 'openpyxl', None
+    with pd.ExcelWriter(output_excel_path, engine=engine, engine_kwargs=engine_kwargs) as writer:
+        df.to_excel(writer, index=False, sheet_name=sheet_name)
+
+        # --- Auto-adjust column widths ---
+        if engine == 'xlsxwriter' or OPENPYXL_AVAILABLE:
+            try:
+                worksheet = writer.sheets[sheet_name]
+
+                # Iterate through columns and set width based on header length + padding
+                for i, column_header in enumerate(df.columns):
+                    header_length = len(str(column_header))
+                    # Add padding; adjust multiplier/minimum as needed
+                    adjusted_width = (header_length + 2) * 1.1
+                    minimum_width = 10 # Ensure a minimum width
+                    width = max(adjusted_width, minimum_width)
+                    if engine == 'xlsxwriter':
+                        worksheet.set_column(i, i, width)
+                    else:
+                        column_letter = get_column_letter(i + 1) # Get column letter (A, B, C...)
+                        worksheet.column_dimensions[column_letter].width = width
+                logger.info("Adjusted column widths based on headers.")
+            except Exception as fmt_e:
+                 logger.warning("Could not auto-adjust column widths: %s", fmt_e)
+        else:
+             logger.warning("openpyxl not fully available, skipping column width adjustment.")
+        # --- End auto-adjust ---
+
+def _feather_copy_path(output_excel_path: Path) -> Path:
+    """Location of the Arrow (Feather) copy kept next to the results workbook."""
+    return output_excel_path.with_suffix('.feather')
+
+def _workbook_version(output_excel_path: Path) -> Dict[bytes, bytes]:
+    """Identifies the workbook's current contents by its exact mtime and size."""
+    stat = output_excel_path.stat()
+    return {
+        FEATHER_MTIME_KEY: str(stat.st_mtime_ns).encode(),
+        FEATHER_SIZE_KEY: str(stat.st_size).encode(),
+    }
+
+def read_processed_data(output_excel_path: Path) -> pd.DataFrame:
+    """
+    Reads the rows already saved to the results file.
+    Prefers the Feather copy, which loads column-wise instead of parsing every cell,
+    but only while the workbook still has the exact mtime and size recorded in it;
+    any other workbook (edited by hand, restored from a backup) is read directly.
+    """
+    feather_path = _feather_copy_path(output_excel_path)
+    try:
+        from pyarrow import feather # Requires pyarrow (the 'columnar' extra)
+        table = feather.read_table(feather_path)
+        metadata = table.schema.metadata or {}
+        if all(metadata.get(key) == value for key, value in _workbook_version(output_excel_path).items()):
+            return table.to_pandas()
+        logger.info("%s does not match its Feather copy; reading the workbook.", output_excel_path)
+    except FileNotFoundError:
+        pass # No copy yet, e.g. the file predates it; it is created on this save
+    except Exception as e: # pyarrow missing or unreadable copy
+        logger.debug("Could not read Feather copy %s, falling back to Excel: %s", feather_path, e)
+    return pd.read_excel(output_excel_path, engine='openpyxl')
+
+def _write_feather_copy(df: pd.DataFrame, output_excel_path: Path):
+    """
+    Writes the Feather copy read by the next run, stamped with the version of the workbook
+    just written. Optional, so failures only drop the copy.
+    """
+    feather_path = _feather_copy_path(output_excel_path)
+    try:
+        import pyarrow as pa # Requires pyarrow (the 'columnar' extra)
+        from pyarrow import feather
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), **_workbook_version(output_excel_path)})
+        feather.write_feather(table, feather_path)
+    except Exception as e:
+        logger.debug("Skipping Feather copy of %s: %s", output_excel_path, e)
+        feather_path.unlink(missing_ok=True) # Never leave a stale copy behind
+
 # --- REFINED FUNCTION ---
 def save_processed_data(
     processed_companies: List[TargetCompanyData], # type: ignore
@@ -51,109 +159,81 @@ def save_processed_data(
     try:
         output_excel_path.parent.mkdir(parents=True, exist_ok=True)
     except Exception as e:
-        logger.error(f"Failed to create output directory {output_excel_path.parent}: {e}", exc_info=True)
+        logger.error("Failed to create output directory %s: %s", output_excel_path.parent, e, exc_info=True)
         return
 
-    # Convert list of dataclass objects to DataFrame
+    # Only the dataclass fields that are written out become columns
+    record_fields = {f.name for f in fields(processed_companies[0])}
+    field_columns = [col for col in OUTPUT_COLUMNS if col in record_fields]
+    if not field_columns:
+        logger.error("No valid columns defined in 'OUTPUT_COLUMNS' match the processed data.")
+        return
+
+    # Build the DataFrame column by column: one attribute sweep per written field, with no
+    # per-company record (asdict() would also deep-copy fields that are never saved)
     try:
-        new_data_list = [asdict(company) for company in processed_companies]
-        new_df = pd.DataFrame(new_data_list)
+        new_df = pd.DataFrame(
+            {col: list(map(attrgetter(col), processed_companies)) for col in field_columns},
+            columns=field_columns
+        )
     except Exception as e:
-        logger.error(f"Failed to convert processed company data to DataFrame: {e}", exc_info=True)
+        logger.error("Failed to convert processed company data to DataFrame: %s", e, exc_info=True)
         return
 
     if new_df.empty:
         logger.info("Processed data resulted in an empty DataFrame. Nothing to save.")
         return
 
-    # Add saving_file_time column
+    # Add saving_file_time as the first column
     current_time_str = datetime.now().strftime("%Y/%m/%d %H:%M:%S")
-    new_df['saving_file_time'] = current_time_str
-
-    # Define the desired order/subset of columns
-    output_columns = [
-        'saving_file_time', 'company_name', 'website', 'recipient_email',
-        'contact_person', 'process_flag', 'target_language', 'main_business',
-        'cooperation_points_str', 'generated_letter_subject',
-        'generated_letter_body', 'processing_status', 'draft_id'
-    ]
-
-    # Filter DataFrame to include only desired columns that exist
-    columns_to_write = [col for col in output_columns if col in new_df.columns]
-    if not columns_to_write:
-        logger.error("No valid columns defined in 'output_columns' match the processed data.")
-        return
-    new_df_filtered = new_df[columns_to_write]
+    new_df.insert(0, 'saving_file_time', current_time_str)
 
     # --- Append Logic ---
     try:
-        combined_df = new_df_filtered # Default to new data
+        combined_df = new_df # Default to new data
         file_exists = output_excel_path.exists()
 
         if file_exists:
-            logger.info(f"Reading existing data from: {output_excel_path}")
+            logger.info("Reading existing data from: %s", output_excel_path)
             try:
-                existing_df = pd.read_excel(output_excel_path, engine='openpyxl')
-                logger.info(f"Found {len(existing_df)} existing records.")
+                existing_df = read_processed_data(output_excel_path)
+                logger.info("Found %s existing records.", len(existing_df))
                 # Align columns before concatenating
                 existing_cols = set(existing_df.columns)
-                new_cols = set(new_df_filtered.columns)
-                base_cols = [col for col in output_columns if col in existing_cols.union(new_cols)]
+                new_cols = set(new_df.columns)
+                known_cols = existing_cols | new_cols # Union built once, not per candidate column
+                base_cols = [col for col in OUTPUT_COLUMNS if col in known_cols]
                 extra_existing_cols = sorted(list(existing_cols.difference(base_cols)))
                 all_cols_ordered = base_cols + extra_existing_cols
                 existing_df_aligned = existing_df.reindex(columns=all_cols_ordered)
-                new_df_aligned = new_df_filtered.reindex(columns=all_cols_ordered)
-                logger.info(f"Appending {len(new_df_aligned)} new records to existing data.")
+                new_df_aligned = new_df.reindex(columns=all_cols_ordered)
+                logger.info("Appending %s new records to existing data.", len(new_df_aligned))
                 combined_df = pd.concat([existing_df_aligned, new_df_aligned], ignore_index=True)
                 # Optional: Duplicate removal logic here...
             except Exception as read_e:
-                logger.error(f"Failed to read/process existing file {output_excel_path}. BACKING UP and overwriting. Error: {read_e}", exc_info=True)
+                logger.error("Failed to read/process existing file %s. BACKING UP and overwriting. Error: %s", output_excel_path, read_e, exc_info=True)
                 try:
                     backup_path = output_excel_path.with_suffix(f".backup_{datetime.now().strftime('%Y%m%d%H%M%S')}.xlsx")
                     output_excel_path.rename(backup_path)
-                    logger.info(f"Backed up existing file to {backup_path}")
+                    logger.info("Backed up existing file to %s", backup_path)
                 except Exception as backup_e:
-                    logger.error(f"Failed to backup existing file {output_excel_path}: {backup_e}")
-                combined_df = new_df_filtered # Fallback to only new data
+                    logger.error("Failed to backup existing file %s: %s", output_excel_path, backup_e)
+                combined_df = new_df # Fallback to only new data
         else:
-            logger.info(f"Creating new results file: {output_excel_path}")
-            # combined_df is already set to new_df_filtered
+            logger.info("Creating new results file: %s", output_excel_path)
+            # combined_df is already set to new_df
 
-        # --- Write to Excel using ExcelWriter for formatting ---
-        sheet_name = 'ProcessedData' # Define a sheet name
-        with pd.ExcelWriter(output_excel_path, engine='openpyxl') as writer:
-            combined_df.to_excel(writer, index=False, sheet_name=sheet_name)
+        _write_workbook(combined_df, output_excel_path)
+        _write_feather_copy(combined_df, output_excel_path)
 
-            # --- Auto-adjust column widths ---
-            if OPENPYXL_AVAILABLE:
-                try:
-                    # Access the workbook and worksheet objects
-                    # workbook = writer.book # Not typically needed for column widths
-                    worksheet = writer.sheets[sheet_name]
-
-                    # Iterate through columns and set width based on header length + padding
-                    for i, column_header in enumerate(combined_df.columns):
-                        column_letter = get_column_letter(i + 1) # Get column letter (A, B, C...)
-                        header_length = len(str(column_header))
-                        # Add padding; adjust multiplier/minimum as needed
-                        adjusted_width = (header_length + 2) * 1.1
-                        minimum_width = 10 # Ensure a minimum width
-                        worksheet.column_dimensions[column_letter].width = max(adjusted_width, minimum_width)
-                    logger.info("Adjusted column widths based on headers.")
-                except Exception as fmt_e:
-                     logger.warning(f"Could not auto-adjust column widths: {fmt_e}")
-            else:
-                 logger.warning("openpyxl not fully available, skipping column width adjustment.")
-            # --- End auto-adjust ---
-
-        num_new = len(new_df_filtered)
+        num_new = len(new_df)
         total_rows = len(combined_df)
-        logger.info(f"Successfully saved data. Added {num_new} new records. Total rows in file: {total_rows}. Path: {output_excel_path}")
+        logger.info("Successfully saved data. Added %s new records. Total rows in file: %s. Path: %s", num_new, total_rows, output_excel_path)
 
     except ImportError:
          logger.error("The 'openpyxl' library is required for Excel operations. Please install it.")
     except Exception as e:
-        logger.error(f"Failed to save data to Excel file '{output_excel_path}': {e}", exc_info=True)
+        logger.error("Failed to save data to Excel file '%s': %s", output_excel_path, e, exc_info=True)
 
 # --- Original commented out code ---
 # ...
\ No newline at end of file
@@ -1,9 +1,33 @@
 # src/utils/helpers.py
 """General utility functions, including logging setup."""
 import logging
+import re
 import sys
 from pathlib import Path
 from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+# Basic email shape check: one '@' and a dot in the domain part (compiled once at import)
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+def is_valid_email(email: str) -> bool:
+    """Returns True if the address has the basic local@domain.tld shape."""
+    return bool(email and _EMAIL_RE.match(email))
+
+def read_cached_by_mtime(path: Path, reader: Callable[[Path], Optional[T]],
+                         cache: Dict[Path, Tuple[float, T]]) -> Optional[T]:
+    """Returns reader(path), reusing the cached value until the file's mtime changes."""
+    mtime = path.stat().st_mtime
+    cached = cache.get(path)
+    if cached and cached[0] == mtime:
+        logging.debug("Using cached contents of %s", path)
+        return cached[1]
+    value = reader(path)
+    if value: # Don't cache failed reads
+        cache[path] = (mtime, value)
+    return value
 
 def setup_logging(log_dir: Path, log_level: str = 'INFO'):
     """Configures logging to file and console manually without basicConfig."""
@@ -70,8 +94,8 @@ def setup_logging(log_dir: Path, log_level: str = 'INFO'):
         logging.info("Logging configured.")
         # Check specifically if OUR file handler was added before logging its path
         if any(isinstance(h, logging.FileHandler) and getattr(h, 'baseFilename', None) == str(log_file) for h in root_logger.handlers):
-            logging.info(f"Log file: {log_file}")
-        logging.info(f"Log level: {logging.getLevelName(root_logger.getEffectiveLevel())}")
+            logging.info("Log file: %s", log_file)
+        logging.info("Log level: %s", logging.getLevelName(root_logger.getEffectiveLevel()))
     else:
         # This case is less likely now unless both handler creations fail
         print(f"ERROR: No handlers configured for logging.", file=sys.stderr)
@@ -3,6 +3,7 @@ import pytest
 import time
 import json
 import logging
+from types import SimpleNamespace
 from typing import Optional, List, Dict
 from unittest.mock import patch, MagicMock, call
 import httpx
@@ -22,17 +23,6 @@ print(f"Is ValueError subclass of BaseException? {issubclass(ValueError, BaseExc
 print("--- Type Checks END ---\n")
 # --- END DIAGNOSTIC CHECK ---
 
-# (Keep the try/except block for openai types if needed)
-try:
-    from openai.types.chat import ChatCompletion, ChatCompletionMessage
-    from openai.types.chat.chat_completion import Choice
-    from openai.types.completion_usage import CompletionUsage
-    OPENAI_TYPES_AVAILABLE = True
-except ImportError:
-    # ... (fallback mocks) ...
-    OPENAI_TYPES_AVAILABLE = False
-    ChatCompletion = MagicMock; ChatCompletionMessage = MagicMock; Choice = MagicMock; CompletionUsage = MagicMock
-
 # Import the client to be tested and its helper
 from src.api_clients.deepseek_client import DeepSeekClient, _create_message
 
@@ -59,32 +49,25 @@ def create_mock_response(status_code: int, headers: Optional[dict] = None, reque
     mock_resp.iter_bytes.return_value = iter([]); mock_resp.iter_text.return_value = iter([]); mock_resp.read.return_value = b""; mock_resp.close = MagicMock()
     return mock_resp
 
-def create_mock_completion(content: Optional[str] = TEST_RESPONSE_CONTENT, finish_reason: str = 'stop', model: str = TEST_MODEL) -> MagicMock:
-    # ... (implementation as before) ...
-    mock_completion = MagicMock(spec=ChatCompletion); mock_completion.id = f"chatcmpl-mockid-{int(time.time()*1000)}"; mock_completion.created = int(time.time())
-    mock_completion.model = model; mock_completion.object = "chat.completion"
-    if content is not None:
-        mock_msg = MagicMock(spec=ChatCompletionMessage); mock_msg.role = 'assistant'; mock_msg.content = content; mock_msg.function_call = None; mock_msg.tool_calls = None
-        mock_choice = MagicMock(spec=Choice); mock_choice.finish_reason = finish_reason; mock_choice.index = 0; mock_choice.message = mock_msg; mock_choice.logprobs = None
-        mock_completion.choices = [mock_choice]; mock_usage = MagicMock(spec=CompletionUsage); prompt_tokens = sum(len(m["content"].split()) for m in TEST_MESSAGES if m.get("content"))
-        completion_tokens = len(content.split()); mock_usage.prompt_tokens = prompt_tokens; mock_usage.completion_tokens = completion_tokens; mock_usage.total_tokens = prompt_tokens + completion_tokens
-        mock_completion.usage = mock_usage
-    else:
-        mock_msg = MagicMock(spec=ChatCompletionMessage); mock_msg.role = 'assistant'; mock_msg.content = None; mock_msg.function_call = None; mock_msg.tool_calls = None
-        mock_choice = MagicMock(spec=Choice); mock_choice.finish_reason = 'stop'; mock_choice.index = 0; mock_choice.message = mock_msg; mock_choice.logprobs = None
-        mock_completion.choices = [mock_choice]; mock_usage = MagicMock(spec=CompletionUsage); prompt_tokens = sum(len(m["content"].split()) for m in TEST_MESSAGES if m.get("content"))
-        mock_usage.prompt_tokens = prompt_tokens; mock_usage.completion_tokens = 0; mock_usage.total_tokens = prompt_tokens; mock_completion.usage = mock_usage
-    mock_completion.system_fingerprint = "mock_fingerprint"
-    return mock_completion
-
-def create_mock_completion_no_choices() -> MagicMock:
-     # ... (implementation as before) ...
-    mock_completion = MagicMock(spec=ChatCompletion); mock_completion.id = f"chatcmpl-mockid-nochoice-{int(time.time()*1000)}"; mock_completion.created = int(time.time())
-    mock_completion.model=TEST_MODEL; mock_completion.object = "chat.completion"; mock_completion.choices = []
-    mock_usage = MagicMock(spec=CompletionUsage); prompt_tokens = sum(len(m["content"].split()) for m in TEST_MESSAGES if m.get("content"))
-    mock_usage.prompt_tokens = prompt_tokens; mock_usage.completion_tokens = 0; mock_usage.total_tokens = prompt_tokens; mock_completion.usage = mock_usage
-    mock_completion.system_fingerprint = "mock_fingerprint_nochoice"
-    return mock_completion
+def _mock_usage(completion_tokens: int = 0) -> SimpleNamespace:
+    prompt_tokens = sum(len(m["content"].split()) for m in TEST_MESSAGES if m.get("content"))
+    return SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, total_tokens=prompt_tokens + completion_tokens)
+
+def create_mock_completion(content: Optional[str] = TEST_RESPONSE_CONTENT, finish_reason: str = 'stop', model: str = TEST_MODEL) -> SimpleNamespace:
+    # The client only reads choices[0].message.content and usage, so a plain namespace is enough
+    mock_msg = SimpleNamespace(role='assistant', content=content, function_call=None, tool_calls=None)
+    mock_choice = SimpleNamespace(finish_reason=finish_reason if content is not None else 'stop', index=0, message=mock_msg, logprobs=None)
+    return SimpleNamespace(
+        id=f"chatcmpl-mockid-{int(time.time()*1000)}", created=int(time.time()), model=model, object="chat.completion",
+        choices=[mock_choice], usage=_mock_usage(len(content.split()) if content is not None else 0),
+        system_fingerprint="mock_fingerprint"
+    )
+
+def create_mock_completion_no_choices() -> SimpleNamespace:
+    return SimpleNamespace(
+        id=f"chatcmpl-mockid-nochoice-{int(time.time()*1000)}", created=int(time.time()), model=TEST_MODEL, object="chat.completion",
+        choices=[], usage=_mock_usage(), system_fingerprint="mock_fingerprint_nochoice"
+    )
 
 
 # --- HELPER FUNCTION for side_effect (Keep diagnostics) ---
@@ -107,7 +90,7 @@ def test_client_init_success():
     with patch('src.api_clients.deepseek_client.OpenAI') as mock_openai_constructor:
         mock_instance = MagicMock(spec=OpenAI); mock_openai_constructor.return_value = mock_instance
         client = DeepSeekClient(api_key=API_KEY); assert client.client == mock_instance
-        mock_openai_constructor.assert_called_once_with(api_key=API_KEY, base_url=DeepSeekClient.DEFAULT_BASE_URL, timeout=DeepSeekClient.DEFAULT_REQUEST_TIMEOUT, max_retries=0)
+        mock_openai_constructor.assert_called_once_with(api_key=API_KEY, base_url=DeepSeekClient.DEFAULT_BASE_URL, timeout=DeepSeekClient.DEFAULT_REQUEST_TIMEOUT, max_retries=0, http_client=client.http_client)
 def test_client_init_requires_api_key():
     with pytest.raises(ValueError, match="API key is required"): DeepSeekClient(api_key="")
     with pytest.raises(ValueError, match="API key is required"): DeepSeekClient(api_key=None)
@@ -115,7 +98,13 @@ def test_client_init_custom_params():
     custom_url = "http://localhost:8080"; custom_timeout = 60
     with patch('src.api_clients.deepseek_client.OpenAI') as mock_openai_constructor:
         client = DeepSeekClient(api_key=API_KEY, base_url=custom_url, request_timeout=custom_timeout)
-        mock_openai_constructor.assert_called_once_with(api_key=API_KEY, base_url=custom_url, timeout=custom_timeout, max_retries=0)
+        mock_openai_constructor.assert_called_once_with(api_key=API_KEY, base_url=custom_url, timeout=custom_timeout, max_retries=0, http_client=client.http_client)
+def test_client_uses_pooled_http_client():
+    client = DeepSeekClient(api_key=API_KEY, request_timeout=15)
+    assert isinstance(client.http_client, httpx.Client)
+    assert client.http_client.timeout == httpx.Timeout(15)
+    client.close()
+    assert client.http_client.is_closed
 
 # Helper Function Test (No mocking needed)
 # (Keep test_create_message_helper)
@@ -143,7 +132,7 @@ def test_get_completion_invalid_response_structure():
     client = DeepSeekClient(api_key=API_KEY)
     mock_response_no_choices = create_mock_completion_no_choices()
     mock_response_no_content = create_mock_completion(content=None)
-    mock_response_empty_object = MagicMock(spec=ChatCompletion); mock_response_empty_object.choices = []
+    mock_response_empty_object = SimpleNamespace(choices=[])
     side_effects = [None, mock_response_empty_object, mock_response_no_choices, mock_response_no_content]
     # Patch the instance method with multiple side effects
     with patch.object(client.client.chat.completions, 'create', side_effect=side_effects) as mock_create_method:
@@ -318,4 +307,32 @@ def test_identify_cooperation_points_empty_desc(): # Removed fixture arg, no moc
     # No need to patch here
     assert client.identify_cooperation_points("", "target") is None
     assert client.identify_cooperation_points("sky", "") is None
-    # (Keep other empty/invalid checks)
\ No newline at end of file
+    # (Keep other empty/invalid checks)
+
+# Response Cache Tests
+def test_extract_main_business_uses_response_cache():
+    """Test repeated identical extraction requests are served from the cache."""
+    client = DeepSeekClient(api_key=API_KEY)
+    mock_response = create_mock_completion(TEST_RESPONSE_CONTENT)
+    with patch.object(client.client.chat.completions, 'create', return_value=mock_response) as mock_create_method:
+        first = client.extract_main_business("Same website content")
+        second = client.extract_main_business("Same website content")
+        assert first == second == TEST_RESPONSE_CONTENT
+        mock_create_method.assert_called_once()
+        assert client.cache_stats() == {"hits": 1, "misses": 1}
+
+        client.extract_main_business("Different website content")
+        assert mock_create_method.call_count == 2
+        assert client.cache_stats() == {"hits": 1, "misses": 2}
+
+@patch('time.sleep', return_value=None, autospec=True)
+def test_response_cache_does_not_store_failures(mock_sleep):
+    """Test failed completions are not cached and are retried on the next call."""
+    client = DeepSeekClient(api_key=API_KEY, max_retries=0)
+    bad_request_error = BadRequestError(message="Invalid", response=MagicMock(), body=None)
+    mock_response = create_mock_completion(TEST_RESPONSE_CONTENT)
+    with patch.object(client.client.chat.completions, 'create', side_effect=[bad_request_error, mock_response]) as mock_create_method:
+        assert client.identify_cooperation_points("Company A desc", "Company B desc") == "No cooperation points identified"
+        assert client.identify_cooperation_points("Company A desc", "Company B desc") == TEST_RESPONSE_CONTENT
+        assert mock_create_method.call_count == 2
+        assert client.cache_stats() == {"hits": 0, "misses": 2}
@@ -0,0 +1,76 @@
+# tests/conftest.py
+"""Shared pytest configuration for the test suite."""
+import hashlib
+import io
+import os
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# RAM-backed filesystem used for tmp_path when available (Linux)
+TMPFS_ROOT = "/dev/shm"
+# Engine used to write every test workbook: xlsxwriter is write-only and faster than
+# openpyxl. Its constant_memory mode is not used because pandas writes cells column by
+# column, and that mode silently drops cells written out of row order.
+EXCEL_ENGINE = "xlsxwriter"
+
+
+def pytest_configure(config):
+    """Points pytest's temporary directory root at tmpfs so tmp_path I/O never hits disk."""
+    if os.environ.get("PYTEST_DEBUG_TEMPROOT") or config.option.basetemp:
+        return # Respect an explicitly chosen location
+    if os.path.ismount(TMPFS_ROOT) and os.access(TMPFS_ROOT, os.W_OK):
+        # Inherited by pytest-xdist workers, which are spawned after configuration
+        os.environ["PYTEST_DEBUG_TEMPROOT"] = TMPFS_ROOT
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_excel_engine():
+    """Imports and initializes the Excel engine once per worker instead of inside the first test."""
+    pd.DataFrame({"warmup": [1]}).to_excel(io.BytesIO(), index=False, engine=EXCEL_ENGINE)
+
+
+@pytest.fixture(scope="session")
+def workbook_cache_dir(tmp_path_factory):
+    """Directory of serialized workbooks shared by every pytest-xdist worker in the run."""
+    base = tmp_path_factory.getbasetemp()
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        base = base.parent # Workers get basetemp/popen-gwN; the parent belongs to the whole run
+    path = base / "workbook-cache"
+    path.mkdir(exist_ok=True)
+    return path
+
+
+@pytest.fixture(scope="session")
+def write_xlsx(workbook_cache_dir):
+    """Returns a helper that writes a DataFrame to an .xlsx file with the pinned engine.
+
+    Each distinct DataFrame is serialized once per run: the first worker to need it
+    publishes the bytes to workbook_cache_dir and the others copy that file.
+    """
+    cache: dict = {}
+
+    def _write(df: pd.DataFrame, path) -> None:
+        key = df.to_json(orient="split")
+        if key not in cache:
+            template = workbook_cache_dir / f"{hashlib.sha1(key.encode()).hexdigest()}.xlsx"
+            if not template.exists():
+                buffer = io.BytesIO()
+                df.to_excel(buffer, index=False, engine=EXCEL_ENGINE)
+                # Publish atomically so a concurrent worker never reads a half-written file
+                partial = template.with_name(f"{template.name}.{os.getpid()}.tmp")
+                partial.write_bytes(buffer.getvalue())
+                os.replace(partial, template)
+            cache[key] = template.read_bytes()
+        Path(path).write_bytes(cache[key])
+    return _write
+
+
+@pytest.fixture(scope="module")
+def shared_tmp(request, tmp_path_factory):
+    """One un-numbered scratch directory per test module; tests use distinct child paths."""
+    path = tmp_path_factory.mktemp(request.module.__name__.rpartition(".")[2], numbered=False)
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
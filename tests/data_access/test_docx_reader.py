@@ -1,3 +1,4 @@
+import io
 import pytest
 from pathlib import Path
 from docx import Document as DocxDocument
@@ -169,4 +170,16 @@ def test_read_skyfend_business_with_none_paragraphs():
         assert result == expected
         
         # Verify the Document was initialized with correct path
-        mock_doc_init.assert_called_once_with(TEST_FILE_PATH) 
\ No newline at end of file
+        mock_doc_init.assert_called_once_with(TEST_FILE_PATH) 
+
+def test_read_skyfend_business_from_file_like_object():
+    """Test a real document built in memory is read from a BytesIO without a file on disk."""
+    doc = DocxDocument()
+    doc.add_paragraph("Paragraph 1.")
+    doc.add_paragraph(" ")
+    doc.add_paragraph("Paragraph 2 has text.")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    buffer.seek(0)
+
+    assert read_skyfend_business(buffer) == EXPECTED_TEXT
@@ -16,35 +16,45 @@ TEST_DATA_DICT = {
     ' Process ': [' yes ', 'YES', 'no', 'Yes', ' Yes ', 'YES']
 }
 
-@pytest.fixture
-def temp_excel_file(tmp_path):
+@pytest.fixture(scope="module")
+def temp_excel_file(tmp_path_factory, write_xlsx):
     """Create a temporary Excel file with standard test data."""
-    file_path = tmp_path / "test_data.xlsx"
+    file_path = tmp_path_factory.mktemp("excel") / "test_data.xlsx"
     df = pd.DataFrame(TEST_DATA_DICT)
-    df.to_excel(file_path, index=False)
+    write_xlsx(df, file_path)
     return file_path
 
-@pytest.fixture
-def temp_excel_missing_cols(tmp_path):
+@pytest.fixture(scope="module")
+def temp_excel_missing_cols(tmp_path_factory, write_xlsx):
     """Create a temporary Excel file with missing required columns."""
-    file_path = tmp_path / "missing_cols.xlsx"
+    file_path = tmp_path_factory.mktemp("excel") / "missing_cols.xlsx"
     data = { # Missing email, contact, process
         'Company': ['Company A'],
         ' Website ': ['example.com'],
     }
     df = pd.DataFrame(data)
-    df.to_excel(file_path, index=False)
+    write_xlsx(df, file_path)
     return file_path
 
-@pytest.fixture
-def temp_excel_empty(tmp_path):
+@pytest.fixture(scope="module")
+def temp_excel_empty(tmp_path_factory, write_xlsx):
     """Create a temporary empty Excel file (only headers)."""
-    file_path = tmp_path / "empty.xlsx"
+    file_path = tmp_path_factory.mktemp("excel") / "empty.xlsx"
     # Ensure columns match what the function expects to avoid key errors if file was not truly empty
     df = pd.DataFrame(columns=[col.strip().lower() for col in TEST_DATA_DICT.keys()])
-    df.to_excel(file_path, index=False)
+    write_xlsx(df, file_path)
     return file_path
 
+@pytest.fixture(scope="module")
+def temp_parquet_file(tmp_path_factory):
+    """Create a temporary Parquet file holding the valid rows of the standard test data."""
+    pytest.importorskip("pyarrow")
+    file_path = tmp_path_factory.mktemp("parquet") / "test_data.parquet"
+    pd.DataFrame(TEST_DATA_DICT).iloc[:2].to_parquet(file_path, index=False)
+    return file_path
+
+# The files above are only ever read, so each is written once per module
+
 # --- Test Cases ---
 
 def test_read_company_data_success(temp_excel_file):
@@ -102,9 +112,9 @@ def test_read_company_data_empty_file(temp_excel_empty):
     assert result == []
 
 @patch('pandas.read_excel', side_effect=Exception("Mocked pandas read error"))
-def test_read_company_data_pandas_error(mock_read_excel, tmp_path):
+def test_read_company_data_pandas_error(mock_read_excel, shared_tmp):
     """Test handling of errors during pandas read_excel call."""
-    dummy_path = tmp_path / "error.xlsx"
+    dummy_path = shared_tmp / "error.xlsx"
     dummy_path.touch()
     with patch('src.data_access.excel_reader.Path.is_file', return_value=True):
         result = read_company_data(dummy_path)
@@ -189,4 +199,61 @@ def test_read_company_data_malformed_urls():
 
     # Assert the actual prefixed/preserved values
     assert comp_a.website == 'https://no-scheme.com' # Correct
-    assert comp_b.website == 'http://already-has-scheme.org' # Correct
\ No newline at end of file
+    assert comp_b.website == 'http://already-has-scheme.org' # Correct
+
+def test_read_company_data_parquet(temp_parquet_file):
+    """Test a Parquet file is read without going through openpyxl."""
+    with patch('pandas.read_excel') as mock_read_excel:
+        result = read_company_data(temp_parquet_file)
+
+    mock_read_excel.assert_not_called()
+    assert [c.company_name for c in result] == ['Test A', 'Company B']
+    assert result[1].recipient_email == 'b@b.org'
+
+
+def test_read_company_data_feather(shared_tmp):
+    """Test a Feather file is dispatched to its columnar reader as well."""
+    pytest.importorskip("pyarrow")
+    file_path = shared_tmp / "test_data.feather"
+    pd.DataFrame(TEST_DATA_DICT).iloc[:2].to_feather(file_path)
+    with patch('pandas.read_excel') as mock_read_excel:
+        result = read_company_data(file_path)
+
+    mock_read_excel.assert_not_called()
+    assert [c.company_name for c in result] == ['Test A', 'Company B']
+
+
+def test_read_company_data_missing_essentials_skipped_in_one_pass(caplog):
+    """Test rows with blank essential cells are dropped together, not read as the string 'nan'."""
+    df = pd.DataFrame({
+        'Company': ['Keep Co', None, 'No Email Co'],
+        'Website': ['keep.com', 'nameless.com', 'noemail.com'],
+        'recipient_email': ['keep@keep.com', 'x@nameless.com', float('nan')],
+        'Process': ['yes', 'yes', 'yes'],
+    })
+
+    with patch('pandas.read_excel', return_value=df), caplog.at_level('WARNING'):
+        result = read_company_data(Path("dummy_path_essentials.xlsx"))
+
+    assert [c.company_name for c in result] == ['Keep Co']
+    assert result[0].contact_person is None # Missing optional column becomes None
+    assert "Skipping 2 row(s) due to missing essential data" in caplog.text
+    assert "Excel rows: [3, 4]" in caplog.text
+
+
+def test_read_company_data_duplicate_normalized_headers(shared_tmp, write_xlsx, caplog):
+    """Test headers that normalize to the same name keep the first column instead of crashing."""
+    file_path = shared_tmp / "duplicate_headers.xlsx"
+    write_xlsx(pd.DataFrame({
+        'Company': ['First Co'],
+        'company ': ['Second Co'],
+        'Website': ['first.com'],
+        'recipient_email': ['a@first.com'],
+        'Process': ['yes'],
+    }), file_path)
+
+    with caplog.at_level('WARNING'):
+        result = read_company_data(file_path)
+
+    assert [c.company_name for c in result] == ['First Co']
+    assert "Ignoring duplicate columns after normalization (first one kept): ['company']" in caplog.text
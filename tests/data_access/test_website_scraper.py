@@ -2,6 +2,7 @@
 import pytest
 import requests
 import requests_mock # Requires pip install requests-mock
+from unittest.mock import MagicMock
 from src.data_access.website_scraper import fetch_website_content
 
 # Define constants for URLs and content used in tests
@@ -129,4 +130,28 @@ def test_fetch_content_with_rate_limiting(requests_mock):
      content = fetch_website_content(ERROR_URL)
      # Retry logic in fetch_website_content should retry on 429, but eventually fail.
      # The exception handler catches RequestException (incl HTTPError) and returns None.
-     assert content is None
\ No newline at end of file
+     assert content is None
+
+
+def test_fetch_content_stops_streaming_at_max_length(monkeypatch):
+    """Test the body is streamed and reading stops once enough characters are decoded."""
+    chunks_read = []
+
+    def iter_content(chunk_size):
+        for i in range(100):
+            chunks_read.append(i)
+            yield b"x" * chunk_size
+
+    mock_response = MagicMock()
+    mock_response.__enter__.return_value = mock_response
+    mock_response.encoding = "utf-8"
+    mock_response.iter_content.side_effect = iter_content
+    mock_get = MagicMock(return_value=mock_response)
+    monkeypatch.setattr("src.data_access.website_scraper._SESSION.get", mock_get)
+
+    content = fetch_website_content(VALID_URL, max_content_length=10000)
+
+    assert content == "x" * 10000
+    assert len(chunks_read) == 2 # 2 x 8192 bytes cover 10000 characters
+    assert mock_get.call_args.kwargs["stream"] is True
+    mock_response.__exit__.assert_called_once()
@@ -2,6 +2,7 @@
 import pytest
 import logging
 from pathlib import Path
+from unittest.mock import patch
 from email.message import Message
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -30,22 +31,20 @@ BODY_HTML = """
 
 # --- Fixtures ---
 
-@pytest.fixture
-def image_files(tmp_path):
-    """Create dummy image files for testing."""
-    img_dir = tmp_path / "images"
-    img_dir.mkdir()
+@pytest.fixture(scope="module")
+def image_files(tmp_path_factory):
+    """Create dummy image files once per module; tests only read them."""
+    img_dir = tmp_path_factory.mktemp("images")
     img1 = img_dir / "logo.png"
     img1.write_text("dummy png data", encoding="utf-8")
     img2 = img_dir / "photo.jpg"
     img2.write_text("dummy jpg data", encoding="utf-8")
     return [img1, img2]
 
-@pytest.fixture
-def attachment_files(tmp_path):
-    """Create dummy attachment files for testing."""
-    att_dir = tmp_path / "attachments"
-    att_dir.mkdir()
+@pytest.fixture(scope="module")
+def attachment_files(tmp_path_factory):
+    """Create dummy attachment files once per module; tests only read them."""
+    att_dir = tmp_path_factory.mktemp("attachments")
     att1 = att_dir / "report.pdf"
     att1.write_text("dummy pdf data", encoding="utf-8")
     att2 = att_dir / "data.xlsx"
@@ -172,6 +171,32 @@ def test_create_mime_email_missing_attachment(caplog, attachment_files):
     assert isinstance(payload[1], MIMEApplication)
     assert f'filename="{attachment_files[0].name}"' in payload[1]['Content-Disposition']
 
+def _unreadable_path(kind, base_file):
+    """Builds a path that open() rejects with the named error."""
+    if kind == "not_a_directory":
+        return base_file / "child.png" # A regular file used as a directory
+    if kind == "nul_byte":
+        return Path("bad\0name.png")
+    return base_file # PermissionError is simulated by patching open
+
+@pytest.mark.parametrize("kind", ["not_a_directory", "nul_byte", "permission_denied"])
+@pytest.mark.parametrize("field", ["inline_image_paths", "attachment_paths"])
+def test_create_mime_email_skips_unreadable_path(caplog, image_files, field, kind):
+    """Test open() errors other than a missing file skip the file instead of aborting the email."""
+    bad_path = _unreadable_path(kind, image_files[1])
+    real_open = open
+
+    def fake_open(path, *args, **kwargs):
+        if kind == "permission_denied" and Path(path) == bad_path:
+            raise PermissionError(13, "Permission denied", str(path))
+        return real_open(path, *args, **kwargs)
+
+    with caplog.at_level(logging.WARNING), patch('src.email_handler.formatter.open', fake_open, create=True):
+        message = create_mime_email(SENDER, TO, SUBJECT, BODY_HTML, **{field: [image_files[0], bad_path]})
+
+    assert "file not found or invalid path, skipping" in caplog.text
+    assert len(message.get_payload()) == 2 # HTML + the one readable file
+
 # Optional: Test error during file read (more complex mocking)
 # from unittest.mock import patch, mock_open
 # def test_create_mime_email_inline_image_read_error(caplog, image_files):
@@ -33,13 +33,17 @@ from src.email_handler.image_selector import (
 def test_extract_keywords_from_filename(filename, expected_keywords):
     assert _extract_keywords_from_filename(filename) == expected_keywords
 
+def test_extract_keywords_from_filename_is_cached():
+    first = _extract_keywords_from_filename("cached_logo.png")
+    assert _extract_keywords_from_filename("cached_logo.png") is first
+    assert isinstance(first, frozenset) # Shared result must be immutable
+
 # --- Fixtures for select_relevant_images ---
 
-@pytest.fixture
-def image_dir_setup(tmp_path):
-    """Creates a temporary directory structure with image files for testing."""
-    img_dir = tmp_path / "test_images"
-    img_dir.mkdir()
+@pytest.fixture(scope="module")
+def image_dir_setup(tmp_path_factory):
+    """Creates the image directory once per module; selection never modifies it."""
+    img_dir = tmp_path_factory.mktemp("test_images")
 
     # Create some dummy image files with relevant names
     (img_dir / "skyfend_logo.png").touch()
@@ -49,8 +53,9 @@ def image_dir_setup(tmp_path):
     (img_dir / "competitor_analysis_chart.png").touch()
     (img_dir / "random_pic.jpg").touch()
 
-    # Create a non-image file
+    # Create non-image files
     (img_dir / "notes.txt").touch()
+    (img_dir / "archive.zip").touch()
 
     return img_dir
 
@@ -128,24 +133,25 @@ def test_select_relevant_images_no_matches(image_dir_setup):
     assert len(selected) == max_images # Fills remaining slots up to max
 
 
-def test_select_relevant_images_fewer_images_than_max(tmp_path):
-    """Test when fewer images exist than max_images requested."""
-    img_dir = tmp_path / "few_images"
-    img_dir.mkdir()
-    (img_dir / "image1.png").touch()
-    (img_dir / "image2.jpg").touch()
+# Names of the image files created by image_dir_setup (non-image files excluded)
+SETUP_IMAGE_NAMES = {
+    "skyfend_logo.png", "drone_detection_system.jpg", "anti_drone_solution.jpeg",
+    "meeting_summary.gif", "competitor_analysis_chart.png", "random_pic.jpg",
+}
 
+def test_select_relevant_images_fewer_images_than_max(image_dir_setup):
+    """Test when fewer images exist than max_images requested."""
     email_body = "Some text"
     company_name = "Company"
-    max_images = 5 # Request more than available
+    max_images = 10 # Request more than available
 
-    selected = select_relevant_images(img_dir, email_body, company_name, max_images)
-    assert len(selected) == 2 # Returns all available images
-    assert {p.name for p in selected} == {"image1.png", "image2.jpg"}
+    selected = select_relevant_images(image_dir_setup, email_body, company_name, max_images)
+    assert len(selected) == len(SETUP_IMAGE_NAMES) # Returns all available images
+    assert {p.name for p in selected} == SETUP_IMAGE_NAMES
 
-def test_select_relevant_images_empty_dir(tmp_path, caplog):
+def test_select_relevant_images_empty_dir(shared_tmp, caplog):
     """Test with an empty image directory."""
-    img_dir = tmp_path / "empty_dir"
+    img_dir = shared_tmp / "empty_dir"
     img_dir.mkdir()
 
     with caplog.at_level(logging.WARNING):
@@ -154,9 +160,9 @@ def test_select_relevant_images_empty_dir(tmp_path, caplog):
     assert selected == []
     assert f"No candidate images found in: {img_dir}" in caplog.text
 
-def test_select_relevant_images_nonexistent_dir(tmp_path, caplog):
+def test_select_relevant_images_nonexistent_dir(shared_tmp, caplog):
     """Test with a non-existent image directory."""
-    img_dir = tmp_path / "non_existent_dir"
+    img_dir = shared_tmp / "non_existent_dir"
     # Do not create the directory
 
     with caplog.at_level(logging.ERROR):
@@ -165,15 +171,8 @@ def test_select_relevant_images_nonexistent_dir(tmp_path, caplog):
     assert selected == []
     assert f"Image directory not found: {img_dir}" in caplog.text
 
-def test_select_relevant_images_ignores_non_images(tmp_path):
+def test_select_relevant_images_ignores_non_images(image_dir_setup):
     """Test that non-image files are ignored by glob."""
-    img_dir = tmp_path / "mixed_files"
-    img_dir.mkdir()
-    (img_dir / "image1.png").touch()
-    (img_dir / "document.txt").touch()
-    (img_dir / "archive.zip").touch()
-    (img_dir / "photo.jpeg").touch()
-
-    selected = select_relevant_images(img_dir, "photo", "company", 5)
-    assert len(selected) == 2
-    assert {p.name for p in selected} == {"image1.png", "photo.jpeg"}
\ No newline at end of file
+    selected = select_relevant_images(image_dir_setup, "photo", "company", 10)
+    assert not {"notes.txt", "archive.zip"} & {p.name for p in selected}
+    assert {p.name for p in selected} == SETUP_IMAGE_NAMES
@@ -28,21 +28,24 @@ google_mock_service.users.return_value.drafts.return_value = google_mock_drafts
 MockHttpError = type('MockHttpError', (Exception,), {})
 
 
-# --- Fixture to apply mocks using monkeypatch ---
-@pytest.fixture(autouse=True)
-def mock_google_libs_via_monkeypatch(monkeypatch):
-    """Uses pytest's monkeypatch fixture to mock imports."""
-    # Mock the modules in sys.modules BEFORE sender is potentially imported by tests
-    monkeypatch.setitem(sys.modules, 'google.oauth2.credentials', google_mock.oauth2.credentials)
-    monkeypatch.setitem(sys.modules, 'google.auth.transport.requests', google_mock.auth.transport.requests)
-    monkeypatch.setitem(sys.modules, 'google_auth_oauthlib.flow', google_mock_oauthlib.flow)
-    monkeypatch.setitem(sys.modules, 'googleapiclient.discovery', MagicMock(build=google_mock_build))
-    # Use the actual HttpError if available and needed for type checking, else mock it
-    try:
-        from googleapiclient.errors import HttpError
-        monkeypatch.setitem(sys.modules, 'googleapiclient.errors', MagicMock(HttpError=HttpError))
-    except ImportError:
-        monkeypatch.setitem(sys.modules, 'googleapiclient.errors', MagicMock(HttpError=MockHttpError))
+# --- Fixture to apply mocks once per module ---
+@pytest.fixture(autouse=True, scope="module")
+def mock_google_libs_via_monkeypatch():
+    """Mocks the Google modules in sys.modules once for the whole module."""
+    # Mock the modules in sys.modules BEFORE sender is potentially imported by tests.
+    # Per-test state lives on the global mocks and is reset by reset_mocks_fixture.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setitem(sys.modules, 'google.oauth2.credentials', google_mock.oauth2.credentials)
+        mp.setitem(sys.modules, 'google.auth.transport.requests', google_mock.auth.transport.requests)
+        mp.setitem(sys.modules, 'google_auth_oauthlib.flow', google_mock_oauthlib.flow)
+        mp.setitem(sys.modules, 'googleapiclient.discovery', MagicMock(build=google_mock_build))
+        # Use the actual HttpError if available and needed for type checking, else mock it
+        try:
+            from googleapiclient.errors import HttpError
+            mp.setitem(sys.modules, 'googleapiclient.errors', MagicMock(HttpError=HttpError))
+        except ImportError:
+            mp.setitem(sys.modules, 'googleapiclient.errors', MagicMock(HttpError=MockHttpError))
+        yield
 
 
 # --- Test Fixtures/Data ---
@@ -61,6 +64,8 @@ def dummy_mime_message():
 @pytest.fixture(autouse=True)
 def reset_mocks_fixture(): # Renamed slightly to avoid confusion
     """Reset mocks before each test function."""
+    from src.email_handler import sender
+    sender._SERVICE_CACHE.clear() # Each test builds its own Gmail client
     # Use the global mock objects defined above
     google_mock.reset_mock(return_value=True, side_effect=True)
     google_mock_oauthlib.reset_mock(return_value=True, side_effect=True)
@@ -277,4 +282,89 @@ def test_save_email_to_drafts_api_no_id(mock_get_creds, dummy_mime_message, capl
     assert "Draft created but no ID returned by API." in caplog.text
     google_mock_build.assert_called_once()
     google_mock_drafts.create.assert_called_once()
-    google_mock_drafts.create.return_value.execute.assert_called_once()
\ No newline at end of file
+    google_mock_drafts.create.return_value.execute.assert_called_once()
+
+
+class _FakeBatch:
+    """Stands in for BatchHttpRequest: runs each queued request on execute and reports it to the callback."""
+    def __init__(self, callback):
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, request.execute(), None)
+            except Exception as exc:
+                self.callback(request_id, None, exc)
+
+
+# sender may already be imported with the real build, so patch it where it is looked up
+@patch('src.email_handler.sender.build', google_mock_build)
+@patch('src.email_handler.sender._get_gmail_credentials')
+def test_save_emails_to_drafts_batches_in_order(mock_get_creds, dummy_mime_message, caplog):
+    from src.email_handler import sender
+    mock_get_creds.return_value = MagicMock()
+    batches = []
+    google_mock_service.new_batch_http_request.side_effect = lambda callback: batches.append(_FakeBatch(callback)) or batches[-1]
+    google_mock_drafts.create.return_value.execute.side_effect = [
+        {'id': 'draft_1'}, Exception("Quota exceeded"), {'id': 'draft_3'},
+    ]
+
+    with patch.object(sender, 'GMAIL_BATCH_LIMIT', 2), caplog.at_level(logging.INFO):
+        draft_ids = sender.save_emails_to_drafts([dummy_mime_message] * 3, TEST_CREDENTIALS_PATH, TEST_TOKEN_PATH)
+
+    assert draft_ids == ['draft_1', None, 'draft_3']
+    assert [len(batch.requests) for batch in batches] == [2, 1] # Split at the batch limit
+    mock_get_creds.assert_called_once_with(TEST_CREDENTIALS_PATH, TEST_TOKEN_PATH)
+    google_mock_build.assert_called_once() # One service for every batch
+    expected_body = {'message': {'raw': base64.urlsafe_b64encode(dummy_mime_message.as_bytes()).decode()}}
+    google_mock_drafts.create.assert_called_with(userId=DUMMY_USER_ID, body=expected_body)
+    assert "Quota exceeded" in caplog.text
+    assert "Created 2/3 drafts." in caplog.text
+
+
+@patch('src.email_handler.sender._get_gmail_credentials')
+def test_save_emails_to_drafts_no_credentials(mock_get_creds, dummy_mime_message):
+    from src.email_handler import sender
+    mock_get_creds.return_value = None
+
+    assert sender.save_emails_to_drafts([dummy_mime_message] * 2, TEST_CREDENTIALS_PATH) == [None, None]
+    google_mock_build.assert_not_called()
+
+
+@patch('src.email_handler.sender.build', google_mock_build)
+@patch('src.email_handler.sender._get_gmail_credentials')
+def test_save_email_to_drafts_reuses_service(mock_get_creds, dummy_mime_message):
+    from src.email_handler import sender
+    mock_get_creds.return_value = MagicMock()
+
+    first = sender.save_email_to_drafts(dummy_mime_message, TEST_CREDENTIALS_PATH, TEST_TOKEN_PATH)
+    second = sender.save_email_to_drafts(dummy_mime_message, TEST_CREDENTIALS_PATH, TEST_TOKEN_PATH)
+
+    assert first == second == 'draft_123'
+    # Credentials are loaded and the client is built only for the first draft
+    mock_get_creds.assert_called_once_with(TEST_CREDENTIALS_PATH, TEST_TOKEN_PATH)
+    google_mock_build.assert_called_once()
+    assert google_mock_drafts.create.call_count == 2
+
+
+@patch('src.email_handler.sender.build', google_mock_build)
+@patch('src.email_handler.sender._get_gmail_credentials')
+def test_save_email_to_drafts_rebuilds_service_after_token_rewrite(mock_get_creds, dummy_mime_message, tmp_path):
+    from src.email_handler import sender
+    mock_get_creds.return_value = MagicMock()
+    token_path = tmp_path / "token.json"
+    token_path.write_text('{"token": "old"}')
+
+    sender.save_email_to_drafts(dummy_mime_message, TEST_CREDENTIALS_PATH, str(token_path))
+    stat = token_path.stat()
+    os.utime(token_path, (stat.st_atime, stat.st_mtime + 1)) # e.g. re-authenticated elsewhere
+    sender.save_email_to_drafts(dummy_mime_message, TEST_CREDENTIALS_PATH, str(token_path))
+
+    assert mock_get_creds.call_count == 2
+    assert google_mock_build.call_count == 2
+    assert len(sender._SERVICE_CACHE) == 1 # The stale client was replaced, not kept alongside
@@ -1,23 +1,23 @@
 # tests/test_main.py
 
+import os
+import pandas as pd
 import pytest
-from unittest.mock import patch, MagicMock
-from src.main import run_process
-
-@pytest.fixture(autouse=True)
-def setup_environment(tmp_path, monkeypatch):
-    monkeypatch.setenv("LOG_LEVEL", "DEBUG")
-    monkeypatch.setenv("DEEPSEEK_API_KEY", "fake_deepseek_key")
-    monkeypatch.setenv("SENDER_EMAIL", "sender@example.com")
-    monkeypatch.setenv("GMAIL_CREDENTIALS_PATH", str(tmp_path / "credentials.json"))
-    monkeypatch.setenv("GMAIL_TOKEN_PATH", str(tmp_path / "token.json"))
-
-    (tmp_path / "credentials.json").touch()
-    (tmp_path / "token.json").touch()
-
-    mock_project_root = tmp_path
-    with patch("src.main.PROJECT_ROOT", mock_project_root):
-        (mock_project_root / "config.ini").write_text("""
+from operator import attrgetter
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock, DEFAULT
+from src import main as main_mod
+from src.main import run_process, load_configuration
+from src.core import TargetCompanyData, DevelopingLetter
+
+@pytest.fixture(scope="module")
+def project_tree(tmp_path_factory):
+    """Builds the read-only project scaffold once per module."""
+    # Only create the files run_process itself checks; image selection and Gmail
+    # access are mocked, so the credentials and images tree are never touched.
+    root = tmp_path_factory.mktemp("project")
+    (root / "config.ini").write_text("""
 [PATHS]
 skyfend_business_doc = skyfend.txt
 company_data_excel = companies.xlsx
@@ -35,31 +35,76 @@ timeout = 10
 [API_CLIENT]
 request_timeout = 20
 """)
-
-        (mock_project_root / "skyfend.txt").write_text("Skyfend business description")
-        (mock_project_root / "companies.xlsx").touch()
-        (mock_project_root / "brochure.pdf").touch()
-        images_dir = mock_project_root / "images"
-        images_dir.mkdir()
-        (images_dir / "image1.jpg").touch()
-        (images_dir / "image2.jpg").touch()
-
+    (root / "skyfend.txt").write_text("Skyfend business description")
+    (root / "companies.xlsx").touch()
+    (root / "brochure.pdf").touch()
+    return root
+
+# Environment run_process reads; the Gmail paths are added per tree by project_environment
+PROJECT_ENV = {
+    "LOG_LEVEL": "DEBUG",
+    "DEEPSEEK_API_KEY": "fake_deepseek_key",
+    "SENDER_EMAIL": "sender@example.com",
+}
+
+@pytest.fixture
+def project_environment(project_tree):
+    env = {
+        **PROJECT_ENV,
+        "GMAIL_CREDENTIALS_PATH": str(project_tree / "credentials.json"),
+        "GMAIL_TOKEN_PATH": str(project_tree / "token.json"),
+    }
+    # The tree is shared, so give each test empty process caches
+    with patch.dict(os.environ, env), \
+         patch.multiple(main_mod, PROJECT_ROOT=project_tree, _CONFIG_CACHE={}, _SKYFEND_DESC_CACHE={}):
         yield
 
-@patch("src.main.read_company_data")
-@patch("src.main.read_skyfend_business")
-@patch("src.main.fetch_website_content")
-@patch("src.main.DeepSeekClient")
-@patch("src.main.DeepSeekLetterGenerator")
-@patch("src.main.select_relevant_images")
-@patch("src.main.create_mime_email")
-@patch("src.main.save_email_to_drafts")
-@patch("src.main.save_processed_data")
-def test_run_process(mock_save_processed, mock_save_drafts, mock_create_email, mock_select_images,
-                     mock_letter_gen, mock_deepseek_client, mock_fetch_content,
-                     mock_read_skyfend, mock_read_company):
-
-    mock_read_skyfend.return_value = "Skyfend business description"
+@pytest.fixture(scope="module")
+def _main_patches():
+    """Patches every collaborator of run_process once per module."""
+    with patch.multiple(
+        main_mod,
+        read_company_data=DEFAULT,
+        read_skyfend_business=DEFAULT,
+        fetch_website_content=DEFAULT,
+        DeepSeekClient=DEFAULT,
+        DeepSeekLetterGenerator=DEFAULT,
+        select_relevant_images=DEFAULT,
+        create_mime_email=DEFAULT,
+        save_emails_to_drafts=DEFAULT,
+        save_processed_data=DEFAULT,
+    ) as mocks:
+        yield mocks
+
+@pytest.fixture
+def main_mocks(_main_patches):
+    """Exposes the shared collaborator mocks by name, cleared of the previous test's setup."""
+    for mock in _main_patches.values():
+        mock.reset_mock(return_value=True, side_effect=True)
+    return SimpleNamespace(**_main_patches)
+
+# Successful collaborator results, shared across tests since run_process never mutates them
+HAPPY_LETTER = DevelopingLetter(subject="Subject", body_html="<p>Body</p>")
+HAPPY_IMAGES = [Path("image1.jpg"), Path("image2.jpg")]
+
+def _configure_happy_path(mocks):
+    """Makes every collaborator succeed for a single processable company."""
+    company = TargetCompanyData(
+        website="http://test.com", recipient_email="test@example.com",
+        company_name="Test Co", contact_person="Jane Doe", process_flag="yes"
+    )
+    mocks.read_skyfend_business.return_value = "Skyfend business description"
+    mocks.read_company_data.return_value = [company]
+    mocks.fetch_website_content.return_value = "Test Co website content"
+    mocks.DeepSeekClient.return_value.extract_main_business.return_value = "Test Co Main Business"
+    mocks.DeepSeekClient.return_value.identify_cooperation_points.return_value = "Cooperation points"
+    mocks.DeepSeekLetterGenerator.return_value.generate.return_value = HAPPY_LETTER
+    mocks.select_relevant_images.return_value = HAPPY_IMAGES
+    mocks.save_emails_to_drafts.return_value = ["draft_id_123"]
+    return company
+
+def test_run_process(main_mocks, project_environment):
+    _configure_happy_path(main_mocks)
 
     # Define realistic company mocks
     test_co = MagicMock()
@@ -83,36 +128,107 @@ def test_run_process(mock_save_processed, mock_save_drafts, mock_create_email, m
     invalid_email_co.should_process = True
     invalid_email_co.processing_status = None
 
-    mock_read_company.return_value = [test_co, skipped_co, invalid_email_co]
-
-    mock_fetch_content.return_value = "Test Co website content"
-    mock_deepseek_client.return_value.extract_main_business.return_value = "Test Co Main Business"
-    mock_deepseek_client.return_value.identify_cooperation_points.return_value = "Cooperation points"
-
-    mock_letter_gen.return_value.generate.return_value.body_html = "Generated Letter HTML"
-    mock_letter_gen.return_value.generate.return_value.subject = "Test Letter Subject"
-
-    mock_select_images.return_value = ["image1.jpg", "image2.jpg"]
-
-    mock_create_email.return_value = MagicMock()
-    mock_save_drafts.return_value = "draft_id_123"
+    main_mocks.read_company_data.return_value = [test_co, skipped_co, invalid_email_co]
 
     run_process()
 
-    assert mock_read_skyfend.call_count == 1
-    assert mock_read_company.call_count == 1
-    assert mock_fetch_content.call_count == 1  # Only one valid company processed
-    mock_deepseek_client.return_value.extract_main_business.assert_called_once_with("Test Co website content")
-    mock_deepseek_client.return_value.identify_cooperation_points.assert_called_once()
-    mock_letter_gen.return_value.generate.assert_called_once()
-    mock_select_images.assert_called_once()
-    mock_create_email.assert_called_once()
-    mock_save_drafts.assert_called_once()
-    mock_save_processed.assert_called_once()
-
-    processed_companies = mock_save_processed.call_args[0][0]
+    assert main_mocks.read_skyfend_business.call_count == 1
+    assert main_mocks.read_company_data.call_count == 1
+    assert main_mocks.fetch_website_content.call_count == 1  # Only one valid company processed
+    main_mocks.DeepSeekClient.return_value.extract_main_business.assert_called_once_with("Test Co website content")
+    main_mocks.DeepSeekClient.return_value.identify_cooperation_points.assert_called_once()
+    main_mocks.DeepSeekLetterGenerator.return_value.generate.assert_called_once()
+    main_mocks.select_relevant_images.assert_called_once()
+    main_mocks.create_mime_email.assert_called_once()
+    main_mocks.save_emails_to_drafts.assert_called_once()
+    main_mocks.save_processed_data.assert_called_once()
+    main_mocks.DeepSeekClient.return_value.close.assert_called_once() # Pooled connections released
+
+    processed_companies = main_mocks.save_processed_data.call_args[0][0]
     assert len(processed_companies) == 1  # Only successfully processed companies recorded
 
     test_co.update_status.assert_called_with("Success: Draft ID draft_id_123")
     skipped_co.update_status.assert_called_with("Skipped: Process flag")
     invalid_email_co.update_status.assert_called_with("Skipped: Invalid email format")
+
+
+@pytest.mark.parametrize(
+    "override, value, expected_status, not_reached",
+    [
+        ("read_company_data", [], None, "fetch_website_content"),
+        ("read_skyfend_business", None, SystemExit, "read_company_data"),
+        ("fetch_website_content", None, "Error: Failed to fetch website", "DeepSeekClient.return_value.extract_main_business"),
+        ("DeepSeekLetterGenerator.return_value.generate",
+         DevelopingLetter(subject="Subject", body_html="<p>Error generating letter content in en.</p>"),
+         "Error: Letter generation failed", "select_relevant_images"),
+        ("select_relevant_images", [Path("image1.jpg")], "Skipped: Found 1/2 images", "create_mime_email"),
+        ("save_emails_to_drafts", [None], "Error: Failed to save draft", None),
+    ],
+    ids=["no_company_data", "no_skyfend", "website_fetch_failed", "letter_failed", "too_few_images", "draft_not_saved"],
+)
+def test_run_process_early_exit(main_mocks, project_environment, override, value, expected_status, not_reached):
+    company = _configure_happy_path(main_mocks)
+    attrgetter(override)(main_mocks).return_value = value
+
+    if expected_status is SystemExit:
+        with pytest.raises(SystemExit):
+            run_process()
+    else:
+        run_process()
+
+    if not_reached:
+        attrgetter(not_reached)(main_mocks).assert_not_called()
+    if isinstance(expected_status, str):
+        assert company.processing_status == expected_status
+        main_mocks.save_processed_data.assert_called_once()
+        assert main_mocks.save_processed_data.call_args[0][0] == [company]
+    else:
+        main_mocks.save_processed_data.assert_not_called()
+
+def test_run_process_saves_all_companies_in_one_write(main_mocks, project_environment):
+    first = _configure_happy_path(main_mocks)
+    second = TargetCompanyData(
+        website="http://second.com", recipient_email="second@example.com",
+        company_name="Second Co", contact_person="John Roe", process_flag="yes"
+    )
+    main_mocks.read_company_data.return_value = [first, second]
+    main_mocks.save_emails_to_drafts.return_value = ["draft_1", "draft_2"]
+
+    run_process()
+
+    # The workbook is written once at the end of the run, never per company
+    main_mocks.save_processed_data.assert_called_once()
+    assert main_mocks.save_processed_data.call_args[0][0] == [first, second]
+    # Both drafts go to Gmail in one batched call, and each company gets its own draft ID
+    main_mocks.save_emails_to_drafts.assert_called_once()
+    assert len(main_mocks.save_emails_to_drafts.call_args[0][0]) == 2
+    assert [first.draft_id, second.draft_id] == ["draft_1", "draft_2"]
+
+def test_run_process_reads_previous_results_via_read_processed_data(main_mocks, project_environment, project_tree):
+    company = _configure_happy_path(main_mocks)
+    processed_path = project_tree / "processed.xlsx"
+    processed_path.touch() # Shared tree: removed again below
+    previous = pd.DataFrame({'recipient_email': [' Test@Example.com ']})
+    try:
+        with patch.object(main_mod, 'read_processed_data', return_value=previous) as mock_read:
+            run_process()
+    finally:
+        processed_path.unlink()
+
+    mock_read.assert_called_once_with(processed_path)
+    assert company.processing_status == "Skipped: Already processed"
+    main_mocks.fetch_website_content.assert_not_called()
+
+def test_load_configuration_is_cached_until_file_changes(tmp_path):
+    config_path = tmp_path / "config.ini"
+    config_path.write_text("[APP_SETTINGS]\nlog_level = INFO\n")
+
+    first = load_configuration(config_path)
+    assert load_configuration(config_path) is first
+
+    config_path.write_text("[APP_SETTINGS]\nlog_level = DEBUG\n")
+    stat = config_path.stat()
+    os.utime(config_path, (stat.st_atime, stat.st_mtime + 1))
+    reloaded = load_configuration(config_path)
+    assert reloaded is not first
+    assert reloaded.get("APP_SETTINGS", "log_level") == "DEBUG"
@@ -1,14 +1,17 @@
 # tests/test_main1.py
 
+import os
 import pytest
 from unittest.mock import MagicMock, patch, ANY
 from pathlib import Path
 import configparser
+from types import SimpleNamespace
 from src import main1
-from src.core import TargetCompanyData, DevelopingLetter, LetterGenerationInput
+from src.core import DevelopingLetter, LetterGenerationInput
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_config():
+    # Read-only for every test, so it is parsed once per module
     config = configparser.ConfigParser()
     config['PATHS'] = {
         'skyfend_business_doc': 'mock_skyfend.docx',
@@ -38,65 +41,129 @@ def mock_config():
     config['LANGUAGE_SETTINGS'] = {
         'default_language': 'en'
     }
+    config['APP_SETTINGS'] = {
+        'process_delay_seconds': '0', # No pause between companies in tests
+    }
     return config
 
-@pytest.fixture(autouse=True)
-def mocks(mocker, mock_config):
-    mocker.patch('src.main1.load_configuration', return_value=mock_config)
-    mocker.patch('src.main1.load_dotenv', return_value=True)
-    mocker.patch('src.main1.setup_logging')
-    mocker.patch('src.main1.read_skyfend_business', return_value="Skyfend Description")
-    mocker.patch('src.main1.read_company_data', return_value=[])
-    mocker.patch('src.main1.pd.read_excel', return_value=MagicMock(columns=['recipient_email']))
-    mocker.patch('src.main1.save_processed_data')
-    mocker.patch('src.main1.create_mime_email')
-    mocker.patch('src.main1.save_email_to_drafts', return_value="draft_id_mock")
-    mocker.patch('src.main1.select_relevant_images', return_value=[Path("img1"), Path("img2"), Path("img3")])
-    mocker.patch('src.main1.DeepSeekClient')
-    mocker.patch('src.main1.DeepSeekLetterGenerator.generate', return_value=DevelopingLetter(subject="Subject", body_html="HTML body"))
-    mocker.patch('src.main1.fetch_website_content', return_value="Website content")
-    mocker.patch('src.main1.determine_language', return_value="en")
-    mocker.patch('pathlib.Path.is_file', return_value=True)
+# Canned results shared by every stub, built once at import rather than per fixture run
+STUB_LETTER = DevelopingLetter(subject="Subject", body_html="HTML body")
+STUB_IMAGES = [Path("img1"), Path("img2"), Path("img3")]
+
+class _FakeMime:
+    """Bare stand-in for the MIME message; save_emails_to_drafts is stubbed, so only its interface matters."""
+    def as_bytes(self):
+        return b""
+
+    def as_string(self):
+        return ""
+
+STUB_MIME_MESSAGE = _FakeMime()
+
+def _returning(value):
+    """Cheap stand-in for a collaborator whose calls the tests never inspect."""
+    return lambda *args, **kwargs: value
+
+class _StubDeepSeekClient:
+    """Plain stand-in for DeepSeekClient; nothing asserts on it, so it skips mock call tracking."""
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def extract_main_business(self, *args, **kwargs):
+        return "Main business"
+
+    def identify_cooperation_points(self, *args, **kwargs):
+        return "Cooperation points"
+
+    def close(self):
+        pass
+
+# Default stand-ins for src.main1 collaborators, applied by the mocks fixture
+DEFAULT_MAIN1_STUBS = {
+    'load_dotenv': _returning(True),
+    'setup_logging': _returning(None),
+    'read_skyfend_business': _returning("Skyfend Description"),
+    'read_company_data': _returning([]),
+    'save_processed_data': _returning(None),
+    'create_mime_email': _returning(STUB_MIME_MESSAGE),
+    'save_emails_to_drafts': lambda mime_messages, *args, **kwargs: ["draft_id_mock"] * len(mime_messages),
+    'select_relevant_images': _returning(STUB_IMAGES),
+    'DeepSeekClient': _StubDeepSeekClient,
+    'fetch_website_content': _returning("Website content"),
+    'determine_language': _returning("en"),
+}
+
+# Variables run_process prefers over config.ini; a developer's shell must not leak into the tests
+MAIN1_ENV_OVERRIDES = ("GMAIL_CREDENTIALS_PATH", "GMAIL_TOKEN_PATH", "SENDER_EMAIL", "DEEPSEEK_API_KEY")
+
+@pytest.fixture(scope="module")
+def project_root(tmp_path_factory, mock_config):
+    """Creates the files run_process checks for, so Path.is_file needs no patching."""
+    root = tmp_path_factory.mktemp("project")
+    paths = mock_config['PATHS']
+    for key in ('skyfend_business_doc', 'company_data_excel', 'product_brochure_pdf'):
+        (root / paths[key]).touch()
+    (root / paths['unified_images_dir']).mkdir()
+    (root / mock_config['EMAIL']['credentials_json_path']).touch()
+    return root
+
+@pytest.fixture(scope="module", autouse=True)
+def mocks(mock_config, project_root):
+    # One module-wide MonkeyPatch instead of mocker.patch; tests that need call assertions
+    # still patch on top with mocker, which is torn down before this context unwinds.
+    with pytest.MonkeyPatch.context() as mp, patch.dict(os.environ):
+        # Snapshot the environment once and drop overrides, so only mock_config drives the run
+        for key in MAIN1_ENV_OVERRIDES:
+            os.environ.pop(key, None)
+        for name, stub in DEFAULT_MAIN1_STUBS.items():
+            mp.setattr(main1, name, stub)
+        mp.setattr(main1, 'load_configuration', _returning(mock_config))
+        mp.setattr(main1, 'PROJECT_ROOT', project_root)
+        mp.setattr(main1, '_SKYFEND_DESC_CACHE', {})
+        mp.setattr(main1.DeepSeekLetterGenerator, 'generate', _returning(STUB_LETTER))
+        yield mp
 
 @pytest.fixture
 def mock_target_company():
-    mock_company = MagicMock(spec=TargetCompanyData)
-    mock_company.company_name = "TestCorp"
-    mock_company.recipient_email = "test@example.com"
-    mock_company.website = "http://example.com"
-    mock_company.should_process = True
-    mock_company.contact_person = "John Doe"
-    mock_company.target_language = None
-    mock_company.processing_status = None
+    # Plain namespace rather than MagicMock(spec=TargetCompanyData): only these fields are read
+    mock_company = SimpleNamespace(
+        company_name="TestCorp",
+        recipient_email="test@example.com",
+        website="http://example.com",
+        should_process=True,
+        contact_person="John Doe",
+        target_language=None,
+        processing_status=None,
+        main_business=None,
+        cooperation_points_str=None,
+        generated_letter_subject=None, # set_letter_content is a mock, so these stay unset
+        generated_letter_body=None,
+        set_letter_content=MagicMock(),
+        set_draft_id=MagicMock(),
+    )
 
     def update_status_side_effect(status):
         mock_company.processing_status = status
 
     mock_company.update_status = MagicMock(side_effect=update_status_side_effect)
-    mock_company.set_letter_content = MagicMock()
-    mock_company.set_draft_id = MagicMock()
     return mock_company
 
-def test_main1_manual_language_override(mocker, mock_target_company):
-    mock_target_company.target_language = 'de'
-    mocker.patch('src.main1.read_company_data', return_value=[mock_target_company])
-    generate_mock = mocker.patch('src.main1.DeepSeekLetterGenerator.generate')
-    main1.run_process()
-    generate_mock.assert_called_once()
-    _, kwargs = generate_mock.call_args
-    assert kwargs['target_language'] == 'de'
-    mock_target_company.update_status.assert_called_with("Success: Draft ID draft_id_mock")
-
-def test_main1_detect_language_success(mocker, mock_target_company):
-    mock_target_company.target_language = None
+@pytest.mark.parametrize(
+    "preset_language, detected_language, expected_language",
+    [('de', None, 'de'), (None, 'fr', 'fr')],
+    ids=["manual_override", "detected"],
+)
+def test_main1_target_language(mocker, mock_target_company, preset_language, detected_language, expected_language):
+    mock_target_company.target_language = preset_language
     mocker.patch('src.main1.read_company_data', return_value=[mock_target_company])
-    determine_language_mock = mocker.patch('src.main1.determine_language', return_value='fr')
+    determine_language_mock = mocker.patch('src.main1.determine_language', return_value=detected_language)
     generate_mock = mocker.patch('src.main1.DeepSeekLetterGenerator.generate')
     main1.run_process()
-    determine_language_mock.assert_called_once()
+    # Detection only runs when the spreadsheet leaves the language blank
+    assert determine_language_mock.called == (preset_language is None)
     generate_mock.assert_called_once()
     _, kwargs = generate_mock.call_args
-    assert kwargs['target_language'] == 'fr'
+    assert kwargs['target_language'] == expected_language
     mock_target_company.update_status.assert_called_with("Success: Draft ID draft_id_mock")
 
 def test_main1_website_fetch_fail_stops_processing(mocker, mock_target_company):
@@ -2,9 +2,11 @@
 import pytest
 import pandas as pd
 import logging
+import shutil
 from pathlib import Path
 from datetime import datetime
 from unittest.mock import patch, MagicMock, ANY
+from openpyxl import load_workbook
 
 # Import the function to test and its dependencies
 from src.utils.excel_writer_to_save_data import save_processed_data
@@ -43,6 +45,14 @@ def mock_datetime():
         mock_dt.now.return_value = frozen_time
         yield frozen_time # Return the frozen time for assertions
 
+def _read_sheet_rows(path: Path) -> list[tuple]:
+    """Reads every row of the first sheet as value tuples; cheaper than building a DataFrame."""
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        return list(workbook.active.iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
 # --- Test Cases ---
 
 # Patch pandas DataFrame and its methods globally for this test file if desired,
@@ -139,4 +149,83 @@ def test_save_processed_data_exception(mock_dataframe_cls, sample_processed_comp
 
     # Verify error log
     assert f"Failed to save processed data to Excel file '{output_path}'" in caplog.text
-    assert error_message in caplog.text
\ No newline at end of file
+    assert error_message in caplog.text
+
+def test_save_processed_data_appends_to_existing(sample_processed_companies, tmp_path, mock_datetime):
+    """Test new rows are appended after the existing ones, checked on the frame handed to the writer."""
+    output_path = tmp_path / "results.xlsx"
+    output_path.touch()
+    existing_df = pd.DataFrame({'company_name': ['Old Co'], 'processing_status': ['Success']})
+
+    # Intercept the combined frame instead of writing and reading the workbook back
+    with patch('src.utils.excel_writer_to_save_data.pd.read_excel', return_value=existing_df), \
+         patch('src.utils.excel_writer_to_save_data._write_workbook') as mock_write:
+        save_processed_data(sample_processed_companies, output_path)
+
+    mock_write.assert_called_once()
+    combined, written_path = mock_write.call_args[0]
+    assert written_path == output_path
+    assert list(combined['company_name']) == ["Old Co", "Company A", "Company B"]
+    expected_timestamp = mock_datetime.strftime("%Y/%m/%d %H:%M:%S")
+    assert list(combined['saving_file_time'].iloc[1:]) == [expected_timestamp] * 2
+    assert combined.columns[0] == 'saving_file_time'
+
+
+def test_save_processed_data_creates_new_file(sample_processed_companies, tmp_path, mock_datetime):
+    """Test a new workbook is written with the header row followed by one row per company."""
+    output_path = tmp_path / "output" / "results.xlsx"
+
+    save_processed_data(sample_processed_companies, output_path)
+
+    header, *rows = _read_sheet_rows(output_path)
+    assert header[0] == 'saving_file_time'
+    assert len(rows) == len(sample_processed_companies)
+    assert rows[0][header.index('company_name')] == "Company A"
+    assert rows[1][header.index('draft_id')] is None
+    assert rows[0][0] == mock_datetime.strftime("%Y/%m/%d %H:%M:%S")
+
+
+def test_save_processed_data_appends_from_feather_copy(sample_processed_companies, tmp_path):
+    """Test a second save reads the existing rows from the Feather copy instead of the workbook."""
+    pytest.importorskip("pyarrow")
+    output_path = tmp_path / "results.xlsx"
+    save_processed_data(sample_processed_companies, output_path)
+    assert output_path.with_suffix('.feather').is_file()
+
+    with patch('src.utils.excel_writer_to_save_data.pd.read_excel') as mock_read_excel:
+        save_processed_data(sample_processed_companies, output_path)
+
+    mock_read_excel.assert_not_called()
+    header, *rows = _read_sheet_rows(output_path)
+    assert [row[header.index('company_name')] for row in rows] == ["Company A", "Company B"] * 2
+    assert len(pd.read_feather(output_path.with_suffix('.feather'))) == 4
+
+
+def test_save_processed_data_ignores_feather_copy_of_restored_workbook(sample_processed_companies, tmp_path):
+    """Test a workbook restored with an older mtime is read directly, not replaced by its newer copy's rows."""
+    pytest.importorskip("pyarrow")
+    output_path = tmp_path / "results.xlsx"
+    backup_path = tmp_path / "results_backup.xlsx"
+    save_processed_data(sample_processed_companies, output_path)
+    shutil.copy2(output_path, backup_path) # copy2 preserves the older mtime
+    save_processed_data(sample_processed_companies, output_path)
+
+    shutil.copy2(backup_path, output_path) # Restore the two-row workbook
+    save_processed_data(sample_processed_companies, output_path)
+
+    header, *rows = _read_sheet_rows(output_path)
+    assert [row[header.index('company_name')] for row in rows] == ["Company A", "Company B"] * 2
+
+
+def test_save_processed_data_writes_links_as_text(sample_processed_companies, tmp_path):
+    """Test websites are stored as plain strings, not converted to hyperlinks."""
+    output_path = tmp_path / "results.xlsx"
+
+    save_processed_data(sample_processed_companies, output_path)
+
+    worksheet = load_workbook(output_path).active
+    header = [cell.value for cell in worksheet[1]]
+    website_cell = worksheet.cell(row=2, column=header.index('website') + 1)
+    assert website_cell.value == "http://companya.com"
+    assert website_cell.hyperlink is None
+    assert worksheet.column_dimensions['A'].width >= 10 # Header-based widths still applied
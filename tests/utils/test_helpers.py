@@ -1,4 +1,5 @@
 # tests/utils/test_helpers.py
+import os
 import pytest
 import logging
 import sys
@@ -7,7 +8,7 @@ from datetime import datetime
 from unittest.mock import patch, MagicMock
 
 # Import the function to test
-from src.utils.helpers import setup_logging
+from src.utils.helpers import setup_logging, is_valid_email, read_cached_by_mtime
 
 # --- Fixtures ---
 
@@ -152,4 +153,45 @@ def test_setup_logging_removes_old_handlers(tmp_path, mock_datetime_log):
     second_file = next((h for h in handlers_after_second if isinstance(h, logging.FileHandler) and Path(getattr(h, 'baseFilename', '')).resolve() == expected_log_path.resolve()), None)
     second_stream = next((h for h in handlers_after_second if isinstance(h, logging.StreamHandler) and h.stream == sys.stdout), None)
     assert first_file is second_file
-    assert first_stream is second_stream
\ No newline at end of file
+    assert first_stream is second_stream
+
+@pytest.mark.parametrize("email, expected", [
+    ("user@example.com", True),
+    ("first.last@sub.example.co.uk", True),
+    ("invalidemail", False),
+    ("user@localhost", False),
+    ("user name@example.com", False),
+    ("", False),
+    (None, False),
+])
+def test_is_valid_email(email, expected):
+    assert is_valid_email(email) is expected
+
+
+def test_read_cached_by_mtime_rereads_only_after_change(tmp_path):
+    doc = tmp_path / "doc.txt"
+    doc.write_text("v1")
+    reader = MagicMock(side_effect=lambda p: p.read_text())
+    cache = {}
+
+    assert read_cached_by_mtime(doc, reader, cache) == "v1"
+    assert read_cached_by_mtime(doc, reader, cache) == "v1"
+    assert reader.call_count == 1
+
+    doc.write_text("v2")
+    mtime = doc.stat().st_mtime
+    os.utime(doc, (mtime + 5, mtime + 5)) # Guarantee a distinct mtime
+    assert read_cached_by_mtime(doc, reader, cache) == "v2"
+    assert reader.call_count == 2
+
+
+def test_read_cached_by_mtime_does_not_cache_failed_reads(tmp_path):
+    doc = tmp_path / "doc.txt"
+    doc.write_text("")
+    reader = MagicMock(return_value=None)
+    cache = {}
+
+    assert read_cached_by_mtime(doc, reader, cache) is None
+    assert read_cached_by_mtime(doc, reader, cache) is None
+    assert reader.call_count == 2
+    assert cache == {}